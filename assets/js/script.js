@@ -19,35 +19,442 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         }
     });
-    
-    // Mark active nav link
-    const currentPath = window.location.pathname;
-    const navLinks = document.querySelectorAll('.nav-link');
-    
-    navLinks.forEach(link => {
-        const linkPath = new URL(link.href).pathname;
-        if (linkPath === currentPath || (currentPath.endsWith('/') && linkPath === currentPath.slice(0, -1))) {
+});
+
+// Pages whose sidebar was not rendered by tools/navigation.py have no
+// baked-in active link; mark it here, in one pass over the nav links.
+(function markActiveNavLink() {
+    if (document.querySelector('.nav-link.active, nav[data-shared-nav]')) return;
+    let page = window.location.origin + window.location.pathname;
+    if (page.endsWith('/')) page += 'index.html';
+    for (const link of document.querySelectorAll('.nav-link')) {
+        if (link.href === page) {
             link.classList.add('active');
+            link.setAttribute('aria-current', 'page');
+            break;
+        }
+    }
+})();
+
+// Site search. The index built by tools/build_search_index.py is sharded by
+// term prefix; nothing is downloaded until the first keystroke, and every
+// shard is fetched at most once per page view.
+(function setupSearch() {
+    const script = document.currentScript;
+    const sidebarHeader = document.querySelector('.sidebar-header');
+    if (!script || !sidebarHeader || !window.fetch) return;
+
+    // script.js lives at <root>/assets/js/, whatever the page depth.
+    const siteRoot = new URL('../../', script.src);
+    const indexRoot = new URL('assets/search/', siteRoot);
+    const MAX_RESULTS = 10;
+    const STOPWORDS = new Set(('a an and are as at be but by for from has have in into is it its of on or ' +
+        'that the their this to was were will with you your use used using can').split(' '));
+    const CJK = /[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]/;
+
+    const container = document.createElement('div');
+    container.className = 'sidebar-search';
+    container.innerHTML = '<input type="search" class="search-input" placeholder="Search docs" ' +
+        'aria-label="Search documentation" autocomplete="off">' +
+        '<ul class="search-results" hidden></ul>';
+    sidebarHeader.insertAdjacentElement('afterend', container);
+    const input = container.querySelector('.search-input');
+    const resultList = container.querySelector('.search-results');
+
+    let manifestPromise = null;
+    const shardCache = new Map();
+    let latestQuery = 0;
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetch(new URL('manifest.json', indexRoot), { cache: 'no-cache' })
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+        }
+        return manifestPromise;
+    }
+
+    function loadShard(manifest, name) {
+        if (!shardCache.has(name)) {
+            const url = new URL(name + '.json?v=' + manifest.rev, indexRoot);
+            shardCache.set(name, fetch(url)
+                .then(response => response.ok ? response.json() : {})
+                .catch(() => ({})));
+        }
+        return shardCache.get(name);
+    }
+
+    // Must stay in step with tokenize() and shard_key() in build_search_index.py.
+    function tokenize(text) {
+        const terms = [];
+        for (const word of text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []) {
+            if (CJK.test(word)) {
+                const chars = Array.from(word);
+                if (chars.length === 1) terms.push(word);
+                for (let i = 0; i < chars.length - 1; i++) terms.push(chars[i] + chars[i + 1]);
+            } else if (word.length > 1 && !STOPWORDS.has(word)) {
+                terms.push(word);
+            }
+        }
+        return terms;
+    }
+
+    function shardKey(text, length) {
+        const prefix = Array.from(text).slice(0, length).join('');
+        if (/^[a-z0-9]+$/.test(prefix)) return prefix;
+        return Array.from(prefix).map(ch => ch.codePointAt(0).toString(16)).join('_');
+    }
+
+    // Exact and prefix matches come from the token's own term shard.
+    async function matchPrefix(manifest, token) {
+        const key = shardKey(token, manifest.keyLength);
+        if (!manifest.terms.includes(key)) return new Map();
+        const shard = await loadShard(manifest, 't-' + key);
+        const scores = new Map();
+        for (const term in shard) {
+            if (!term.startsWith(token)) continue;
+            const factor = term === token ? 1 : 0.5;
+            for (const [doc, weight] of shard[term]) {
+                scores.set(doc, Math.max(scores.get(doc) || 0, weight * factor));
+            }
         }
+        return scores;
+    }
+
+    // Fallback for infixes and typos: find terms sharing most trigrams.
+    async function matchTrigrams(manifest, token) {
+        const padded = ' ' + token + ' ';
+        const grams = new Set();
+        for (let i = 0; i + 3 <= padded.length; i++) grams.add(padded.slice(i, i + 3));
+        const counts = new Map();
+        await Promise.all(Array.from(grams, async gram => {
+            const key = shardKey(gram, manifest.gramKeyLength);
+            if (!manifest.grams.includes(key)) return;
+            const shard = await loadShard(manifest, 'g-' + key);
+            for (const term of shard[gram] || []) counts.set(term, (counts.get(term) || 0) + 1);
+        }));
+        const candidates = Array.from(counts)
+            .filter(([, count]) => count * 2 >= grams.size)
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, 5);
+        const scores = new Map();
+        await Promise.all(candidates.map(async ([term]) => {
+            const shard = await loadShard(manifest, 't-' + shardKey(term, manifest.keyLength));
+            for (const [doc, weight] of shard[term] || []) {
+                scores.set(doc, Math.max(scores.get(doc) || 0, weight * 0.3));
+            }
+        }));
+        return scores;
+    }
+
+    async function search(query) {
+        const manifest = await loadManifest();
+        const tokens = Array.from(new Set(tokenize(query)));
+        if (!manifest || !tokens.length) return [];
+
+        const perToken = await Promise.all(tokens.map(async token => {
+            const scores = await matchPrefix(manifest, token);
+            return scores.size || token.length < 3 ? scores : matchTrigrams(manifest, token);
+        }));
+
+        // Documents must match every token that matched anything at all.
+        const matched = perToken.filter(scores => scores.size);
+        if (!matched.length) return [];
+        const totals = new Map();
+        for (const [doc, score] of matched[0]) {
+            let total = score;
+            let everywhere = true;
+            for (const other of matched.slice(1)) {
+                if (!other.has(doc)) { everywhere = false; break; }
+                total += other.get(doc);
+            }
+            if (everywhere) totals.set(doc, total);
+        }
+        const top = Array.from(totals).sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, MAX_RESULTS);
+
+        return Promise.all(top.map(async ([doc]) => {
+            const chunk = await loadShard(manifest, 'd-' + Math.floor(doc / manifest.docChunk));
+            return chunk[doc % manifest.docChunk];
+        }));
+    }
+
+    function render(docs) {
+        resultList.textContent = '';
+        for (const doc of docs) {
+            if (!doc) continue;
+            const [url, title, heading, snippet] = doc;
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.className = 'search-result';
+            link.href = new URL(url, siteRoot).href;
+            const label = document.createElement('span');
+            label.className = 'search-result-title';
+            label.textContent = heading && heading !== title ? title + ' › ' + heading : title;
+            const text = document.createElement('span');
+            text.className = 'search-result-snippet';
+            text.textContent = snippet;
+            link.append(label, text);
+            item.append(link);
+            resultList.append(item);
+        }
+        resultList.hidden = !resultList.firstChild;
+    }
+
+    input.addEventListener('input', async function() {
+        const queryId = ++latestQuery;
+        const docs = input.value.trim() ? await search(input.value) : [];
+        if (queryId === latestQuery) render(docs);
     });
-});
-// Auto-set active navigation link based on current URL
-(function setActiveNavLink() {
-    const currentPath = window.location.pathname;
-    const navLinks = document.querySelectorAll('.nav-link');
-    
-    navLinks.forEach(link => {
-        const href = link.getAttribute('href');
-        if (!href) return;
-        
-        // Create a temporary anchor to resolve relative paths
-        const tempAnchor = document.createElement('a');
-        tempAnchor.href = href;
-        
-        if (currentPath === tempAnchor.pathname || (currentPath === '/' && tempAnchor.pathname.endsWith('index.html'))) {
-            link.classList.add('active');
+
+    input.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape') {
+            input.value = '';
+            render([]);
+        }
+    });
+})();
+
+// Search results link to headings by slug; headings only get an id when the
+// URL actually asks for one that is not on the page.
+function revealHeadingFromHash() {
+    const hash = decodeURIComponent(window.location.hash.slice(1));
+    if (!hash || document.getElementById(hash)) return;
+
+    const seen = new Set();
+    for (const heading of document.querySelectorAll('.main-content h2, .main-content h3')) {
+        const text = heading.textContent.trim().replace(/\s+/g, ' ');
+        const base = heading.id || text.toLowerCase().replace(/[^\p{L}\p{N}_]+/gu, '-')
+            .replace(/^-+|-+$/g, '') || 'section';
+        let slug = base;
+        for (let n = 2; seen.has(slug); n++) slug = base + '-' + n;
+        seen.add(slug);
+        if (slug === hash) {
+            heading.id = slug;
+            heading.scrollIntoView();
+            return;
+        }
+    }
+}
+revealHeadingFromHash();
+
+// Shared sidebar. With "shared": true in tools/data/nav.json, pages carry
+// only a <nav data-shared-nav="..."> placeholder and the nav itself is one
+// file (assets/nav/nav.html) with root-relative links. The last copy seen is
+// kept in localStorage so the sidebar shows without waiting for the network;
+// the file is revalidated on every view, which is a 304 until the nav changes.
+(function setupSharedNav() {
+    let current = document.querySelector('nav[data-shared-nav]');
+    if (!current || !window.fetch) return;
+
+    const source = current.getAttribute('data-shared-nav');
+    const navUrl = new URL(source, window.location.href);
+    // The nav file lives at <root>/assets/nav/.
+    const siteRoot = new URL('../../', navUrl);
+    // One copy per nav file: each locale (tools/build_locales.py) has its own.
+    const STORAGE_KEY = 'gcc-shared-nav:' + navUrl.pathname;
+    let shownVersion = null;
+
+    function pageUrl() {
+        const url = window.location.origin + window.location.pathname;
+        return url.endsWith('/') ? url + 'index.html' : url;
+    }
+
+    function show(html) {
+        const template = document.createElement('template');
+        template.innerHTML = html;
+        const nav = template.content.querySelector('nav');
+        if (!nav) return false;
+        const version = nav.getAttribute('data-nav-version');
+        if (version && version === shownVersion) return true;
+        const page = pageUrl();
+        for (const link of nav.querySelectorAll('a[href]')) {
+            const href = new URL(link.getAttribute('href'), siteRoot).href;
+            link.setAttribute('href', href);
+            if (href === page) {
+                link.classList.add('active');
+                link.setAttribute('aria-current', 'page');
+            }
+        }
+        nav.setAttribute('data-shared-nav', source);
+        current.replaceWith(nav);
+        current = nav;
+        shownVersion = version;
+        return true;
+    }
+
+    try {
+        const cached = window.localStorage.getItem(STORAGE_KEY);
+        if (cached) show(cached);
+    } catch (e) {
+        // Storage disabled: wait for the network.
+    }
+
+    fetch(navUrl, { cache: 'no-cache' })
+        .then(response => response.ok ? response.text() : null)
+        .then(html => {
+            if (!html || !show(html)) return;
+            try {
+                window.localStorage.setItem(STORAGE_KEY, html);
+            } catch (e) {
+                // Quota or disabled storage; the HTTP cache still has it.
+            }
+        })
+        .catch(() => {});
+})();
+
+// Instant navigation. tools/build_fragments.py writes every page's title and
+// .content-wrapper to assets/fragments/<page>.json. Links to other doc pages
+// at the same depth (so the sidebar's relative links stay valid) are
+// prefetched on hover/focus and swapped into .main-content on click; anything
+// else, or a missing fragment, is a normal page load.
+(function setupInstantNavigation() {
+    const script = document.currentScript;
+    const main = document.querySelector('.main-content');
+    if (!script || !main || !window.fetch || !window.history.pushState) return;
+
+    const siteRoot = new URL('../../', script.src);
+    const fragmentRoot = new URL('assets/fragments/', siteRoot);
+    const CACHE_SIZE = 20;
+    // page path -> Promise<fragment | null>, least recently used first
+    const cache = new Map();
+
+    function pagePath(url) {
+        if (url.origin !== siteRoot.origin || !url.pathname.startsWith(siteRoot.pathname)) return null;
+        const path = decodeURI(url.pathname.slice(siteRoot.pathname.length)) || 'index.html';
+        return path.endsWith('.html') ? path : null;
+    }
+
+    function depth(path) {
+        return path.split('/').length - 1;
+    }
+
+    let shownPath = pagePath(new URL(window.location.href));
+    if (!shownPath) return;
+    const startDepth = depth(shownPath);
+
+    function candidate(link) {
+        if (!link || link.target || link.hasAttribute('download')) return null;
+        const url = new URL(link.href);
+        const path = pagePath(url);
+        if (!path || path === shownPath || depth(path) !== startDepth) return null;
+        return path;
+    }
+
+    function load(path) {
+        let promise = cache.get(path);
+        if (promise) {
+            cache.delete(path);
+        } else {
+            promise = fetch(new URL(path + '.json', fragmentRoot))
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+        }
+        cache.set(path, promise);
+        if (cache.size > CACHE_SIZE) cache.delete(cache.keys().next().value);
+        return promise;
+    }
+
+    function prefetch(event) {
+        const link = event.target.closest ? event.target.closest('a[href]') : null;
+        const path = candidate(link);
+        if (path) load(path);
+    }
+
+    function markActive(url) {
+        const previous = document.querySelector('.nav-link.active');
+        if (previous) {
+            previous.classList.remove('active');
+            previous.removeAttribute('aria-current');
+        }
+        const pageUrl = url.origin + url.pathname;
+        for (const link of document.querySelectorAll('.nav-link')) {
+            if (link.href === pageUrl) {
+                link.classList.add('active');
+                link.setAttribute('aria-current', 'page');
+                break;
+            }
+        }
+    }
+
+    function show(fragment, url, path, scrollY) {
+        shownPath = path;
+        document.title = fragment.title;
+        main.innerHTML = fragment.html;
+        markActive(url);
+        const sidebar = document.getElementById('sidebar');
+        if (sidebar) sidebar.classList.remove('open');
+
+        const target = url.hash && document.getElementById(decodeURIComponent(url.hash.slice(1)));
+        if (scrollY !== undefined) {
+            window.scrollTo(0, scrollY);
+        } else if (target) {
+            target.scrollIntoView();
         } else {
-            link.classList.remove('active');
+            window.scrollTo(0, 0);
+            if (url.hash) revealHeadingFromHash();
+        }
+    }
+
+    function navigate(url, path, push) {
+        load(path).then(fragment => {
+            if (!fragment) {
+                if (push) window.location.href = url.href;
+                else window.location.reload();
+                return;
+            }
+            if (push) window.history.pushState({}, '', url.href);
+            const state = window.history.state;
+            show(fragment, url, path, push || !state ? undefined : state.scrollY);
+        });
+    }
+
+    // Remember the scroll position of each history entry for back/forward.
+    if ('scrollRestoration' in window.history) window.history.scrollRestoration = 'manual';
+    let scrollTimer = null;
+    window.addEventListener('scroll', () => {
+        clearTimeout(scrollTimer);
+        scrollTimer = setTimeout(() => {
+            window.history.replaceState(Object.assign({}, window.history.state, { scrollY: window.scrollY }), '');
+        }, 100);
+    }, { passive: true });
+
+    document.addEventListener('mouseover', prefetch);
+    document.addEventListener('focusin', prefetch);
+    document.addEventListener('touchstart', prefetch, { passive: true });
+
+    document.addEventListener('click', event => {
+        if (event.defaultPrevented || event.button !== 0 ||
+            event.metaKey || event.ctrlKey || event.shiftKey || event.altKey) return;
+        const link = event.target.closest ? event.target.closest('a[href]') : null;
+        const path = candidate(link);
+        if (!path) return;
+        event.preventDefault();
+        clearTimeout(scrollTimer);
+        window.history.replaceState(Object.assign({}, window.history.state, { scrollY: window.scrollY }), '');
+        navigate(new URL(link.href), path, true);
+    });
+
+    window.addEventListener('popstate', () => {
+        const url = new URL(window.location.href);
+        const path = pagePath(url);
+        // Hash change within the page being shown: let the browser scroll.
+        if (path === shownPath) return;
+        if (!path || depth(path) !== startDepth) {
+            window.location.reload();
+            return;
         }
+        navigate(url, path, false);
+    });
+})();
+
+// Offline support. sw.js is generated by tools/build_service_worker.py; if it
+// has not been built, registration simply fails.
+(function registerServiceWorker() {
+    const script = document.currentScript;
+    if (!script || !('serviceWorker' in navigator)) return;
+    const siteRoot = new URL('../../', script.src);
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(new URL('sw.js', siteRoot), { scope: siteRoot.pathname })
+            .catch(() => {});
     });
 })();
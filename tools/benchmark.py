@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tools/ pipeline on synthetic doc trees.
+
+For each requested size a throwaway tree is generated: the real index.html,
+assets and tools, plus N copies of foundations/color.html (~60 KB each)
+spread over every section, with some nested one level deeper
+(foundations/group-3/...). Every pipeline step then runs as its own process,
+twice: cold (fresh tree, no build caches) and warm (again, nothing changed).
+Each page transform is also timed in memory over every page, first on the
+untouched pages (cold) and then on its own output (warm). For each run
+we record wall time, peak RSS and bytes read/written (Linux only; worker
+processes started with --jobs are not included in RSS and I/O).
+
+    python tools/benchmark.py --pages 100 1000 --output bench.json
+    python tools/benchmark.py --pages 1000 --baseline bench.json
+
+With --baseline, results are compared run by run and the exit status is 1
+if any got slower or bigger than --tolerance allows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import critical_css
+import update_docs
+from build_assets import ASSETS
+from html_regions import find_elements
+from rewrite_engine import TARGET_DIRS, discover_pages
+
+RESULTS_VERSION = 1
+MODEL_PAGE = 'foundations/color.html'
+NESTED_EVERY = 10
+GROUP_SIZE = 50
+
+TRANSFORMS = update_docs.PIPELINE + [critical_css.TRANSFORM]
+
+# Pipeline order: later steps depend on the output of earlier ones.
+STEPS = [
+    ('build_assets', ['build_assets.py']),
+    ('update_docs', ['update_docs.py']),
+    ('sync_docs', ['sync_docs.py']),
+    ('sync_docs --check', ['sync_docs.py', '--check']),
+    ('critical_css', ['critical_css.py']),
+    ('build_locales', ['build_locales.py']),
+    ('build_search_index', ['build_search_index.py']),
+    ('build_fragments', ['build_fragments.py']),
+    ('build_service_worker', ['build_service_worker.py']),
+    ('check_links', ['check_links.py', '--no-orphans']),
+]
+JOBS_STEPS = frozenset(['update_docs.py', 'sync_docs.py', 'critical_css.py', 'build_locales.py',
+                        'build_search_index.py', 'build_fragments.py', 'check_links.py'])
+
+# Regressions smaller than this are noise, whatever the ratio.
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA = 4 * 1024 * 1024
+
+_TITLE_RE = re.compile(r'<title>.*?</title>|<h1>.*?</h1>', re.DOTALL)
+
+
+def model_page(path=MODEL_PAGE):
+    """The page every synthetic page is copied from, with a SIDEBAR region."""
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    if 'GCC:SIDEBAR_START' not in html:
+        spans = find_elements(html, 'nav.sidebar-nav')
+        if spans:
+            start, end = spans[0]
+            html = (html[:start] + '<!-- GCC:SIDEBAR_START -->\n' + html[start:end]
+                    + '\n<!-- GCC:SIDEBAR_END -->' + html[end:])
+    return html
+
+
+def page_path(n):
+    directory = TARGET_DIRS[n % len(TARGET_DIRS)]
+    if n % NESTED_EVERY == NESTED_EVERY - 1:
+        directory += f'/group-{n // GROUP_SIZE}'
+    return f'{directory}/page-{n}.html'
+
+
+def generate_tree(dest, pages, source='.'):
+    """Write a synthetic site with `pages` pages to `dest`; returns its size."""
+    model = model_page(os.path.join(source, MODEL_PAGE))
+    shutil.copytree(os.path.join(source, 'tools'), os.path.join(dest, 'tools'),
+                    ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    for path in ASSETS + ['index.html']:
+        os.makedirs(os.path.join(dest, os.path.dirname(path)), exist_ok=True)
+        shutil.copy(os.path.join(source, path), os.path.join(dest, path))
+    total = 0
+    for n in range(pages):
+        path = page_path(n)
+        depth = path.count('/')
+        title = f'Page {n}'
+        html = _TITLE_RE.sub(lambda m: (f'<title>{title} - GCC Design System</title>'
+                                        if m.group().startswith('<title') else f'<h1>{title}</h1>'), model)
+        if depth > 1:
+            html = html.replace('"../', '"' + '../' * depth)
+        os.makedirs(os.path.join(dest, os.path.dirname(path)), exist_ok=True)
+        data = html.encode('utf-8')
+        with open(os.path.join(dest, path), 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def _proc_io(pid):
+    try:
+        with open(f'/proc/{pid}/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def run_step(argv, cwd):
+    """Run one tool; returns its measurements and stdout."""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable] + argv, cwd=cwd,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.stdout.read()
+    proc.stdout.close()
+    read_bytes = written_bytes = None
+    if hasattr(os, 'waitid'):
+        # Leave the process unreaped for a moment so /proc/<pid>/io is readable.
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        read_bytes, written_bytes = _proc_io(proc.pid)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - started
+    max_rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    return {
+        'seconds': round(elapsed, 4),
+        'max_rss': max_rss,
+        'read_bytes': read_bytes,
+        'written_bytes': written_bytes,
+        'exit': proc.returncode,
+    }, output.decode('utf-8', 'replace')
+
+
+def time_transforms():
+    """Time every page transform in memory over the current tree (as JSON)."""
+    pages = []
+    for path in discover_pages():
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((path, f.read()))
+    results = {}
+    for transform in TRANSFORMS:
+        timings = {}
+        contents = pages
+        for phase in ('cold', 'warm'):
+            started = time.perf_counter()
+            contents = [(path, transform.apply(content, path) if transform.wants(path) else content)
+                        for path, content in contents]
+            timings[phase] = round(time.perf_counter() - started, 4)
+        results[transform.name] = timings
+    print(json.dumps(results))
+
+
+def benchmark_size(pages, jobs, keep=False):
+    """Generate a tree of `pages` pages and time every step on it."""
+    tree = tempfile.mkdtemp(prefix=f'gcc-bench-{pages}-')
+    try:
+        started = time.perf_counter()
+        tree_bytes = generate_tree(tree, pages)
+        result = {
+            'pages': pages,
+            'tree_bytes': tree_bytes,
+            'generate_seconds': round(time.perf_counter() - started, 4),
+            'steps': {},
+        }
+        # Transforms go first, while the pages are still untouched.
+        measured, output = run_step(['tools/benchmark.py', '--time-transforms'], tree)
+        if measured['exit']:
+            raise SystemExit(f"Timing transforms failed:\n{output}")
+        result['transforms'] = json.loads(output)
+        for name, timings in result['transforms'].items():
+            print(f"{pages:>7} {'transform ' + name:<22} cold {timings['cold']:8.3f}s  "
+                  f"warm {timings['warm']:8.3f}s", flush=True)
+        for phase in ('cold', 'warm'):
+            for name, argv in STEPS:
+                argv = ['tools/' + argv[0]] + argv[1:]
+                if os.path.basename(argv[0]) in JOBS_STEPS:
+                    argv += ['--jobs', str(jobs)]
+                measured, _ = run_step(argv, tree)
+                result['steps'].setdefault(name, {})[phase] = measured
+                print(f"{pages:>7} {name:<22} {phase:<5} {format_run(measured)}", flush=True)
+        if keep:
+            print(f"Kept {tree}")
+        return result
+    finally:
+        if not keep:
+            shutil.rmtree(tree, ignore_errors=True)
+
+
+def format_run(run):
+    parts = [f"{run['seconds']:8.3f}s", f"rss {run['max_rss'] / 2**20:7.1f} MB"]
+    if run['read_bytes'] is not None:
+        parts.append(f"read {run['read_bytes'] / 2**20:8.1f} MB")
+        parts.append(f"written {run['written_bytes'] / 2**20:8.1f} MB")
+    if run['exit']:
+        parts.append(f"exit {run['exit']}")
+    return '  '.join(parts)
+
+
+def compare(results, baseline, tolerance):
+    """Return regressions of `results` against `baseline` as printable lines."""
+    regressions = []
+    for size, current in results['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size)
+        if previous is None:
+            continue
+        pairs = []
+        for name, phases in current['steps'].items():
+            for phase, run in phases.items():
+                old = previous['steps'].get(name, {}).get(phase)
+                if old is not None:
+                    pairs.append((name, phase, run, old))
+        for name, phases in current.get('transforms', {}).items():
+            for phase, seconds in phases.items():
+                old = previous.get('transforms', {}).get(name, {}).get(phase)
+                if old is not None:
+                    pairs.append((f'transform {name}', phase, {'seconds': seconds}, {'seconds': old}))
+        for name, phase, run, old in pairs:
+            for metric, floor in (('seconds', MIN_SECONDS_DELTA), ('max_rss', MIN_RSS_DELTA)):
+                if metric not in run:
+                    continue
+                new_value, old_value = run[metric], old[metric]
+                if new_value > old_value * (1 + tolerance) and new_value - old_value > floor:
+                    # A zero baseline (e.g. a transform too fast to time) has no ratio.
+                    change = f"+{new_value / old_value - 1:.0%}" if old_value else 'n/a'
+                    regressions.append(f"{size} pages, {name} ({phase}): {metric} "
+                                       f"{old_value} -> {new_value} ({change})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the doc tools on synthetic trees.')
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 1000],
+                        help='tree sizes to benchmark (default 100 1000)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='--jobs passed to the tools that take it (default 1)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against results from an earlier --output')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown/growth against the baseline (default 0.2 = 20%%)')
+    parser.add_argument('--keep', action='store_true', help='keep the generated trees')
+    parser.add_argument('--time-transforms', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.time_transforms:
+        time_transforms()
+        return
+
+    results = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'jobs': args.jobs,
+        'sizes': {},
+    }
+    for pages in args.pages:
+        results['sizes'][str(pages)] = benchmark_size(pages, args.jobs, args.keep)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+            f.write('\n')
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}")
+        print(f"{len(regressions)} regressions against {args.baseline}.")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Minify, fingerprint and precompress the site's CSS and JS.
+
+For every file in ASSETS this writes a minified copy with a content hash in
+its name (assets/css/styles.1a2b3c4d.css), a gzip sibling (.css.gz) and
+records the mapping in assets/asset-manifest.json together with the cache
+headers each path should be served with. A Netlify/Cloudflare-style
+`_headers` file is written at the site root from the same data.
+
+sync_docs.py reads the asset manifest and rewrites every page's <link> and
+<script> references to the fingerprinted names in the same pass that injects
+the sidebar, so run this first:
+
+    python tools/build_assets.py && python tools/sync_docs.py
+"""
+
+import gzip
+import json
+import os
+import re
+
+from build_manifest import hash_bytes
+
+ASSETS = ['assets/css/styles.css', 'assets/js/script.js']
+ASSET_MANIFEST = 'assets/asset-manifest.json'
+HEADERS_FILE = '_headers'
+HASH_LENGTH = 8
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=0, must-revalidate'
+
+_CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)''', re.DOTALL)
+
+
+def minify_css(text):
+    """Strip comments and insignificant whitespace, leaving strings untouched."""
+    out = []
+    last = 0
+    for match in _CSS_TOKEN_RE.finditer(text):
+        out.append(_squeeze_css(text[last:match.start()]))
+        if match.group(1):
+            out.append(match.group(1))
+        last = match.end()
+    out.append(_squeeze_css(text[last:]))
+    return ''.join(out).strip()
+
+
+def _squeeze_css(chunk):
+    chunk = re.sub(r'\s+', ' ', chunk)
+    # Spaces around + and - are significant inside calc(), so leave them.
+    chunk = re.sub(r' ?([{};,>]) ?', r'\1', chunk)
+    chunk = re.sub(r': ', ':', chunk)
+    return chunk.replace(';}', '}')
+
+
+def minify_js(text):
+    """Conservative JS minification: drop comment-only lines and indentation.
+
+    No tokenizer is involved, so code, strings and regex literals are never
+    rewritten; the savings come from the generous indentation and comments.
+    Block comments are only removed at the start of a line, and code after
+    their `*/` is kept.
+    """
+    out = []
+    in_block_comment = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_block_comment:
+            end = stripped.find('*/')
+            if end == -1:
+                continue
+            in_block_comment = False
+            stripped = stripped[end + 2:].lstrip()
+        while stripped.startswith('/*'):
+            end = stripped.find('*/', 2)
+            if end == -1:
+                in_block_comment = True
+                stripped = ''
+                break
+            stripped = stripped[end + 2:].lstrip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        out.append(stripped)
+    return '\n'.join(out) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def fingerprinted_name(path, data):
+    stem, ext = os.path.splitext(path)
+    return f'{stem}.{hash_bytes(data)[:HASH_LENGTH]}{ext}'
+
+
+def fingerprint_pattern(path):
+    """Regex source matching `path` with or without any fingerprint."""
+    stem, ext = os.path.splitext(path)
+    return re.escape(stem) + rf'(?:\.[0-9a-f]{{{HASH_LENGTH}}})?' + re.escape(ext)
+
+
+def remove_stale(path, keep):
+    """Delete older fingerprinted copies (and .gz) of `path`."""
+    directory = os.path.dirname(path)
+    pattern = re.compile(fingerprint_pattern(os.path.basename(path)) + r'(?:\.gz)?$')
+    for name in os.listdir(directory):
+        full = os.path.join(directory, name)
+        if full in keep or name == os.path.basename(path):
+            continue
+        if pattern.fullmatch(name):
+            os.remove(full)
+
+
+def write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def build_asset(path):
+    """Minify, fingerprint and gzip one asset. Returns its hashed path."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    minify = MINIFIERS.get(os.path.splitext(path)[1], lambda text: text)
+    data = minify(source).encode('utf-8')
+    hashed = fingerprinted_name(path, data)
+    write_if_changed(hashed, data)
+    # mtime=0 keeps the .gz byte-identical across builds.
+    write_if_changed(hashed + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    remove_stale(path, keep={hashed, hashed + '.gz'})
+    print(f"{path} -> {hashed} ({len(source.encode('utf-8'))} -> {len(data)} bytes)")
+    return hashed
+
+
+def load_asset_manifest(path=ASSET_MANIFEST):
+    """Return the asset manifest, or None if assets have not been built."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compile_asset_rewriter(assets):
+    """Return a bytes -> bytes function pointing asset references at `assets`.
+
+    `assets` maps source paths to fingerprinted paths (as in the manifest).
+    References are matched with any relative prefix and with or without an
+    older fingerprint, so re-running after an asset change just works.
+    """
+    if not assets:
+        return lambda data: data
+    sources = list(assets)
+    alternatives = '|'.join(f'(?P<a{i}>{fingerprint_pattern(src)})' for i, src in enumerate(sources))
+    pattern = re.compile(rf'(?<=["\'/])(?:{alternatives})(?=["\'?#])'.encode('utf-8'))
+    targets = [assets[src].encode('utf-8') for src in sources]
+
+    def rewrite(data):
+        return pattern.sub(lambda m: targets[int(m.lastgroup[1:])], data)
+    return rewrite
+
+
+def write_headers_file(headers, path=HEADERS_FILE):
+    lines = []
+    for url_pattern, cache_control in headers.items():
+        lines.append(url_pattern)
+        lines.append(f'  Cache-Control: {cache_control}')
+    write_if_changed(path, ('\n'.join(lines) + '\n').encode('utf-8'))
+
+
+def main():
+    assets = {path: build_asset(path) for path in ASSETS}
+    headers = {f'/{hashed}': IMMUTABLE for hashed in assets.values()}
+    headers['/*.html'] = REVALIDATE
+    headers['/'] = REVALIDATE
+    # Written by build_service_worker.py; must never be served stale.
+    headers['/sw.js'] = REVALIDATE
+    headers['/precache-manifest.json'] = REVALIDATE
+
+    manifest = {'assets': assets, 'headers': headers}
+    write_if_changed(ASSET_MANIFEST, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+    write_headers_file(headers)
+    print(f"Wrote {ASSET_MANIFEST} and {HEADERS_FILE}. Run tools/sync_docs.py to update page references.")
+
+
+if __name__ == '__main__':
+    main()
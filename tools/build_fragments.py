@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Write a lightweight content fragment for every page, for instant navigation.
+
+For each page this writes assets/fragments/<page>.json holding the page
+title and the outer HTML of its .content-wrapper:
+
+    {"title": "Button - GCC Design System", "html": "<div class=\"content-wrapper\">..."}
+
+script.js prefetches these on hover/focus and swaps .main-content on click
+instead of doing a full page load. Fragments are only rewritten when their
+content changes, and fragments of deleted pages are removed. Run after
+sync_docs.py so fragments match the synced pages.
+"""
+
+import argparse
+import json
+import os
+import re
+
+from build_assets import write_if_changed
+from build_search_index import discover_pages
+from html_regions import find_elements
+from parallel import add_jobs_argument, map_pages
+
+OUTPUT_DIR = 'assets/fragments'
+CONTENT_SELECTOR = 'div.content-wrapper'
+
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.DOTALL)
+
+
+def fragment_path(page, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, page + '.json')
+
+
+def extract_fragment(file_path):
+    """Return (file_path, payload bytes or None, error) for one page."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        spans = find_elements(html, CONTENT_SELECTOR)
+    except Exception as e:
+        return file_path, None, str(e)
+    if not spans:
+        # Nothing to swap in; the client falls back to a full load.
+        return file_path, None, None
+    start, end = spans[0]
+    title = _TITLE_RE.search(html)
+    fragment = {
+        'title': ' '.join(title.group(1).split()) if title else '',
+        'html': html[start:end],
+    }
+    payload = json.dumps(fragment, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return file_path, payload, None
+
+
+def remove_stale(keep, output_dir=OUTPUT_DIR):
+    """Delete fragments whose page no longer exists (or lost its content)."""
+    removed = 0
+    for dirpath, _dirnames, filenames in os.walk(output_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if name.endswith('.json') and path not in keep:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write per-page content fragments for instant navigation.')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'output directory (default {OUTPUT_DIR})')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    written = 0
+    keep = set()
+    failed = False
+    for file_path, payload, error in map_pages(extract_fragment, discover_pages(), jobs=args.jobs):
+        if error is not None:
+            print(f"Error processing {file_path}: {error}")
+            failed = True
+            continue
+        if payload is None:
+            continue
+        path = fragment_path(file_path, args.output)
+        keep.add(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if write_if_changed(path, payload):
+            written += 1
+    removed = remove_stale(keep, args.output)
+    print(f"Done! {written} fragments written, {len(keep) - written} unchanged, {removed} removed.")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Build a copy of the site for every locale under /<locale>/.
+
+Each catalog in tools/data/locales/<locale>.json maps English strings, as
+HTML exactly as they appear in nav.json, the partials and page titles, to
+the locale's:
+
+    {"lang": "ja", "messages": {"Color": "カラー", "Last updated:": "最終更新日:"}}
+
+A locale page is the English page with its regions re-rendered in that
+locale (nav labels, header strings and status), an inline sidebar nav (on
+pages without a SIDEBAR region) translated in place, its <title> and <h1>
+translated, <html lang> set, and references to assets and other non-page
+files pointed one level further up, so /ja/ shares the root's assets. Page
+links stay inside the locale. Untranslated strings fall back to English.
+
+All locales are built in one run: partials are compiled and localized once,
+and every page is read and its regions indexed once, then rendered for each
+locale. Pages are spread over --jobs worker processes. Outputs are tracked
+in their own build manifest, so unchanged pages are skipped. Run after
+sync_docs.py and critical_css.py:
+
+    python tools/build_locales.py [--locale ja ...] [--force] [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+from urllib.parse import urlsplit
+
+import instrumentation
+import navigation
+import sync_docs
+from build_assets import write_if_changed
+from build_manifest import BuildManifest, hash_bytes, hash_file, inputs_key, stat_signature
+from instrumentation import STATS, Progress
+from html_regions import find_elements
+from page_metadata import PageHistory, PageMetadata
+from parallel import add_jobs_argument, map_pages
+from regions import RegionIndex, start_marker
+
+LOCALES_DIR = 'tools/data/locales'
+LOCALES_MANIFEST = '.gcc-build/locales.json'
+
+# Bump whenever the way locale pages are derived changes.
+LOCALE_VERSION = 2
+
+# A text node with its surrounding whitespace.
+_TEXT_RE = re.compile(r'>(\s*)([^<>]*[^\s<>])(\s*)<')
+_TITLE_RE = re.compile(rb'(<title>)(.*?)(</title>)', re.DOTALL)
+_H1_RE = re.compile(rb'<h1>.*?</h1>', re.DOTALL)
+_LANG_RE = re.compile(rb'(<html\b[^>]*?\slang=")[^"]*(")')
+_URL_ATTR_RE = re.compile(r'(\s(?:href|src)=")([^"]*)(")')
+TITLE_SEPARATOR = ' - '
+INLINE_NAV = 'nav.sidebar-nav'
+
+
+class Catalog:
+    """One locale's messages, keyed by the English HTML text."""
+
+    def __init__(self, locale, lang, messages):
+        self.locale = locale
+        self.lang = lang
+        self.messages = messages
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        locale = os.path.splitext(os.path.basename(path))[0]
+        return cls(locale, data.get('lang', locale), data.get('messages', {}))
+
+    def gettext(self, text):
+        return self.messages.get(text, text)
+
+    def translate_html(self, html):
+        """Translate every text node of `html` that has a message."""
+        def text_node(match):
+            text = match.group(2)
+            translated = self.messages.get(text)
+            if translated is None:
+                return match.group()
+            return f'>{match.group(1)}{translated}{match.group(3)}<'
+        return _TEXT_RE.sub(text_node, html)
+
+    def translate_title(self, title):
+        """'Color - GCC Design System' -> each part translated on its own."""
+        if title in self.messages:
+            return self.messages[title]
+        return TITLE_SEPARATOR.join(self.gettext(part) for part in title.split(TITLE_SEPARATOR))
+
+
+def load_catalogs(locales=None, directory=LOCALES_DIR):
+    """locale -> Catalog for every catalog in `directory` (or just `locales`)."""
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    except FileNotFoundError:
+        names = []
+    catalogs = {}
+    for name in names:
+        locale = name[:-len('.json')]
+        if locales is None or locale in locales:
+            catalogs[locale] = Catalog.load(os.path.join(directory, name))
+    missing = set(locales or ()) - set(catalogs)
+    if missing:
+        raise SystemExit(f"No catalog for {', '.join(sorted(missing))} in {directory}")
+    return catalogs
+
+
+def output_path(locale, page):
+    return f'{locale}/{page}'
+
+
+def locale_keys(catalogs, partials, assets, pages):
+    """locale -> inputs key shared by every page of that locale."""
+    base = inputs_key(LOCALE_VERSION, sync_docs.build_inputs_key(partials, assets),
+                      hash_bytes('\n'.join(pages).encode('utf-8')))
+    return {locale: inputs_key(base, hash_file(os.path.join(LOCALES_DIR, locale + '.json')))
+            for locale in catalogs}
+
+
+# Installed once per worker process by init_worker.
+_worker = {}
+
+def init_worker(templates, catalogs, metadata, history, pages):
+    _worker['catalogs'] = catalogs
+    _worker['metadata'] = metadata
+    _worker['history'] = history
+    _worker['pages'] = pages
+    # Partials localized once per locale, then cached per parameter set as usual.
+    _worker['templates'] = {
+        locale: {name: template.map_literals(catalog.translate_html)
+                 for name, template in templates.items()}
+        for locale, catalog in catalogs.items()
+    }
+    _worker['urls'] = {}
+
+
+def relocate_url(directory, url):
+    """`url` as seen from one directory deeper, for a non-page reference."""
+    parts = urlsplit(url)
+    if not parts.path or parts.scheme or parts.netloc or parts.path.startswith('/'):
+        return url
+    target = posixpath.normpath(posixpath.join(directory, parts.path))
+    if target == '.' or parts.path.endswith('/'):
+        target = posixpath.join(target, 'index.html')
+    # Links to pages stay inside the locale, even broken ones, which then
+    # stay as broken as in the English page instead of leaving the locale.
+    if posixpath.normpath(target) in _worker['pages'] or target.endswith('.html'):
+        return url
+    return '../' + url
+
+
+def relocate(html, page):
+    directory = posixpath.dirname(page)
+    urls = _worker['urls']
+
+    def attr(match):
+        key = (directory, match.group(2))
+        url = urls.get(key)
+        if url is None:
+            url = urls[key] = relocate_url(directory, match.group(2))
+        return match.group(1) + url + match.group(3)
+    return _URL_ATTR_RE.sub(attr, html)
+
+
+def split_inline_nav(html):
+    """(head, nav, tail) of a page whose sidebar nav is not in a SIDEBAR region.
+
+    `nav` is None (and `tail` empty) when there is no such nav.
+    """
+    if 'sidebar-nav' not in html or start_marker(sync_docs.NAV_REGION).decode('ascii') in html:
+        return html, None, ''
+    spans = find_elements(html, INLINE_NAV)
+    if not spans:
+        return html, None, ''
+    start, end = spans[0]
+    return html[:start], html[start:end], html[end:]
+
+
+def scan_page(html, page):
+    """Split a relocated page around its inline nav and index each side's regions."""
+    head, nav, tail = split_inline_nav(html)
+    return (RegionIndex.scan(head.encode('utf-8'), page), nav,
+            RegionIndex.scan(tail.encode('utf-8'), page))
+
+
+def render_locale(parts, params, catalog, templates, page):
+    """The locale's version of a relocated page, from its already-scanned parts."""
+    translate = catalog.translate_html
+    if params is not None:
+        params = dict(params, STATUS=catalog.gettext(params['STATUS']))
+
+    def render_regions(index):
+        replacements = {}
+        for name in index.names():
+            if name == sync_docs.NAV_REGION:
+                replacements[name] = navigation.render_sidebar(page, '', translate=translate).encode('utf-8')
+                continue
+            template = templates.get(sync_docs.partial_for_region(name))
+            if template is not None:
+                # The nav only links pages; partials may reference anything.
+                replacements[name] = relocate(template.render_cached(**params), page).encode('utf-8')
+        return index.splice(replacements)
+
+    head, nav, tail = parts
+    output = render_regions(head)
+    if nav is not None:
+        output += translate(nav).encode('utf-8') + render_regions(tail)
+    output = _TITLE_RE.sub(lambda m: m.group(1) + catalog.translate_title(m.group(2).decode('utf-8'))
+                           .encode('utf-8') + m.group(3), output, count=1)
+    output = _H1_RE.sub(lambda m: translate(m.group().decode('utf-8')).encode('utf-8'), output)
+    return _LANG_RE.sub(lambda m: m.group(1) + catalog.lang.encode('utf-8') + m.group(2), output, count=1)
+
+
+def build_page(task):
+    """Render one page for `locales`.
+
+    Returns (page, [(locale, status, output_hash)], error, stats).
+    """
+    page, locales = task
+    results = []
+    try:
+        with STATS.timer('read'), open(page, 'rb') as f:
+            raw = f.read()
+        STATS.count('bytes_in', len(raw))
+        # Everything that does not depend on the locale is done once: asset
+        # references relocated, inline nav found, regions indexed, partial
+        # params worked out.
+        with STATS.timer('scan'):
+            parts = scan_page(relocate(raw.decode('utf-8'), page), page)
+            templates = _worker['templates'][locales[0]]
+            params = None
+            names = parts[0].names() + parts[2].names()
+            if any(name != sync_docs.NAV_REGION and sync_docs.partial_for_region(name) in templates
+                   for name in names):
+                params, _ = sync_docs.page_params(raw, page, _worker['metadata'], _worker['history'])
+        for locale in locales:
+            with STATS.timer('render'):
+                output = render_locale(parts, params, _worker['catalogs'][locale],
+                                       _worker['templates'][locale], page)
+            path = output_path(locale, page)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with STATS.timer('write'):
+                written = write_if_changed(path, output)
+            if written:
+                STATS.count('bytes_out', len(output))
+            results.append((locale, 'written' if written else 'unchanged', hash_bytes(output)))
+    except Exception as e:
+        return page, results, str(e), STATS.take()
+    return page, results, None, STATS.take()
+
+
+def write_shared_navs(catalogs):
+    """Write (or remove) each locale's copy of the shared nav file."""
+    for locale, catalog in catalogs.items():
+        path = output_path(locale, navigation.SHARED_NAV_PATH)
+        data = navigation.shared_nav_bytes(translate=catalog.translate_html)
+        if data is None:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if write_if_changed(path, data):
+            print(f"Wrote {path}")
+
+
+def build(locales=None, force=False, jobs=1, quiet=False):
+    with STATS.timer('load-inputs'):
+        catalogs = load_catalogs(locales)
+        partials = sync_docs.load_partials()
+        templates = sync_docs.compile_partials(partials)
+        assets = sync_docs.load_assets()
+        metadata = PageMetadata.load()
+        history = PageHistory().load()
+        manifest = BuildManifest(LOCALES_MANIFEST).load()
+        pages = sync_docs.discover_pages()
+        keys = locale_keys(catalogs, partials, assets, pages)
+
+    if not catalogs:
+        print(f"No catalogs in {LOCALES_DIR}; nothing to build.")
+        return True
+
+    # A page's output is fresh if it was built from these inputs and this
+    # exact source file; only the locales that are not get rendered.
+    tasks = []
+    page_keys = {}
+    skipped = 0
+    for page in pages:
+        source = stat_signature(page)
+        stale = []
+        for locale in catalogs:
+            key = page_keys[page, locale] = inputs_key(keys[locale], metadata.signature(page), source)
+            if force or not manifest.is_fresh(output_path(locale, page), key):
+                stale.append(locale)
+            else:
+                skipped += 1
+        if stale:
+            tasks.append((page, tuple(stale)))
+
+    results = map_pages(build_page, tasks, jobs=jobs, initializer=init_worker,
+                        initargs=(templates, catalogs, metadata, history, frozenset(pages)))
+
+    written = 0
+    errors = []
+    STATS.count('pages_skipped', skipped)
+    progress = Progress(len(tasks), quiet)
+    for page, outputs, error, stats in results:
+        STATS.merge(stats)
+        for locale, status, output_hash in outputs:
+            path = output_path(locale, page)
+            manifest.record(path, page_keys[page, locale], output_hash)
+            if status == 'written':
+                written += 1
+            else:
+                skipped += 1
+        if error is not None:
+            errors.append(page)
+            print(f"Error processing {page}: {error}")
+        progress.step(f"Processing {page} ({', '.join(locale for locale, _, _ in outputs)})..."
+                      if any(status == 'written' for _, status, _ in outputs) else None)
+    progress.close()
+    STATS.count('pages_written', written)
+
+    write_shared_navs(catalogs)
+
+    with STATS.timer('save-state'):
+        # Drop locale copies of pages that no longer exist.
+        outputs = {output_path(locale, page) for locale in catalogs for page in pages}
+        for path in list(manifest.pages):
+            if path.split('/', 1)[0] in catalogs and path not in outputs:
+                if os.path.exists(path):
+                    os.remove(path)
+                manifest.forget(path)
+        manifest.save()
+    print(f"Done! {len(catalogs)} locales ({', '.join(catalogs)}): {written} written, {skipped} unchanged.")
+    return not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a copy of the site per locale under /<locale>/.')
+    parser.add_argument('--locale', nargs='+', metavar='LOCALE',
+                        help=f'only these locales (default: every catalog in {LOCALES_DIR})')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the build manifest and re-render every page')
+    add_jobs_argument(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    ok = instrumentation.run(args, 'build_locales', build, locales=args.locale, force=args.force,
+                             jobs=args.jobs, quiet=args.quiet)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
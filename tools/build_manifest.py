@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Persistent build manifest used by the doc tools for incremental builds.
+
+The manifest records, for every page, the stat signature and content hash of
+the file as last written plus a key describing the inputs it was built from
+(partials, transform version, render parameters). A page whose stat signature
+and inputs key both match can be skipped without even being read.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_PATH = '.gcc-build/manifest.json'
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the hex SHA-256 digest of a file's contents."""
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+def inputs_key(*parts):
+    """Combine any number of string inputs into a single stable key."""
+    return hash_bytes('\0'.join(str(p) for p in parts).encode('utf-8'))
+
+
+def stat_signature(path):
+    """Return a cheap (mtime_ns, size) signature for a file."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+class BuildManifest:
+    """Per-page record of what was last built and from which inputs."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.pages = {}
+        self.dirty = False
+
+    def load(self):
+        """Load the manifest from disk, starting empty if missing or stale."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('version') == MANIFEST_VERSION:
+            self.pages = data.get('pages', {})
+        return self
+
+    def save(self):
+        """Write the manifest back to disk if anything was recorded."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'pages': self.pages}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def get(self, page):
+        return self.pages.get(page)
+
+    def is_fresh(self, page, key):
+        """True if the page is unchanged on disk since it was built from `key`."""
+        entry = self.pages.get(page)
+        if not entry or entry.get('inputs') != key:
+            return False
+        try:
+            return entry.get('stat') == stat_signature(page)
+        except OSError:
+            return False
+
+    def matches(self, page, key, content_hash):
+        """True if `content_hash` is exactly what was built from `key`."""
+        entry = self.pages.get(page)
+        return bool(entry) and entry.get('inputs') == key and entry.get('hash') == content_hash
+
+    def record(self, page, key, content_hash, **extra):
+        """Record the current on-disk state of a page after a build."""
+        entry = {'inputs': key, 'hash': content_hash, 'stat': stat_signature(page)}
+        entry.update(extra)
+        if self.pages.get(page) != entry:
+            self.pages[page] = entry
+            self.dirty = True
+
+    def forget(self, page):
+        """Drop the entry for a single page, if any."""
+        if self.pages.pop(page, None) is not None:
+            self.dirty = True
+
+    def prune(self, keep):
+        """Drop entries for pages that no longer exist in the build."""
+        keep = set(keep)
+        for page in list(self.pages):
+            if page not in keep:
+                del self.pages[page]
+                self.dirty = True
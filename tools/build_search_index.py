@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Build the sharded full-text search index loaded by assets/js/script.js.
+
+Every page is split into sections at its h1/h2/h3 headings. Each section
+becomes a search document (url#anchor, page title, heading, snippet), and its
+terms go into an inverted index. The index is written as small compact JSON
+shards so the client only downloads what a query needs:
+
+    assets/search/manifest.json    shard keys, doc chunk count, version
+    assets/search/t-<key>.json     term -> [[doc, weight], ...] for terms
+                                   starting with <key> (prefix queries are
+                                   answered from the same shard)
+    assets/search/g-<key>.json     trigram -> [term, ...] for trigrams
+                                   starting with <key> (infix/typo fallback)
+    assets/search/d-<n>.json       documents n*DOC_CHUNK .. (n+1)*DOC_CHUNK-1
+
+Nothing is fetched until the first keystroke in the search box.
+"""
+
+import argparse
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+from build_manifest import hash_bytes
+from parallel import add_jobs_argument, map_pages
+from rewrite_engine import discover_pages
+
+OUTPUT_DIR = 'assets/search'
+# Files write_shards() owns in the output directory (besides manifest.json).
+_SHARD_NAME_RE = re.compile(r'[tg]-[^/]+\.json|d-\d+\.json')
+INDEX_VERSION = 1
+SHARD_KEY_LENGTH = 2
+GRAM_KEY_LENGTH = 1
+DOC_CHUNK = 100
+SNIPPET_LENGTH = 160
+MAX_WEIGHT = 255
+
+TITLE_WEIGHT = 8
+HEADING_WEIGHT = 4
+BODY_WEIGHT = 1
+
+TITLE_SUFFIX = ' - GCC Design System'
+SKIP_TAGS = frozenset(['script', 'style', 'nav', 'aside', 'noscript', 'template'])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3'])
+
+STOPWORDS = frozenset('''
+a an and are as at be but by for from has have in into is it its of on or
+that the their this to was were will with you your use used using can
+'''.split())
+
+WORD_RE = re.compile(r'\w+')
+CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+
+def tokenize(text):
+    """Split text into index terms (kept in step with tokenize() in script.js)."""
+    terms = []
+    for word in WORD_RE.findall(text.lower()):
+        if CJK_RE.search(word):
+            # No spaces between Japanese words: index overlapping bigrams.
+            if len(word) == 1:
+                terms.append(word)
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 and word not in STOPWORDS:
+            terms.append(word)
+    return terms
+
+
+def trigrams(term):
+    padded = f' {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def shard_key(text, length=SHARD_KEY_LENGTH):
+    """File-name-safe shard key for the first `length` characters."""
+    prefix = text[:length]
+    if re.fullmatch(r'[a-z0-9]+', prefix):
+        return prefix
+    return '_'.join(f'{ord(ch):x}' for ch in prefix)
+
+
+def slugify(text):
+    slug = re.sub(r'[^\w]+', '-', text.lower()).strip('-')
+    return slug or 'section'
+
+
+class _SectionExtractor(HTMLParser):
+    """Collect the page title and heading-delimited text sections."""
+
+    def __init__(self):
+        super().__init__()
+        self.title = ''
+        self.sections = []          # [anchor, heading, [text...]]
+        self._in_title = False
+        self._skip_depth = 0
+        self._heading = None        # [tag, id, [text...]] while inside a heading
+        self._anchors = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'title':
+            self._in_title = True
+        elif tag in HEADING_TAGS and not self._skip_depth:
+            self._heading = [tag, dict(attrs).get('id'), []]
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'title':
+            self._in_title = False
+        elif self._heading is not None and tag == self._heading[0]:
+            _, heading_id, parts = self._heading
+            self._heading = None
+            heading = ' '.join(''.join(parts).split())
+            anchor = ''
+            if tag != 'h1':
+                anchor = heading_id or slugify(heading)
+                base, n = anchor, 2
+                while anchor in self._anchors:
+                    anchor = f'{base}-{n}'
+                    n += 1
+                self._anchors.add(anchor)
+            self.sections.append([anchor, heading, []])
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._skip_depth:
+            return
+        elif self._heading is not None:
+            self._heading[2].append(data)
+        elif self.sections:
+            self.sections[-1][2].append(data)
+
+
+def extract_page(file_path):
+    """Return (file_path, title, sections, error) for one page."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        parser = _SectionExtractor()
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        return file_path, '', [], str(e)
+    title = ' '.join(parser.title.split())
+    if title.endswith(TITLE_SUFFIX):
+        title = title[:-len(TITLE_SUFFIX)]
+    sections = [(anchor, heading, ' '.join(''.join(parts).split()))
+                for anchor, heading, parts in parser.sections]
+    if not sections:
+        sections = [('', title, '')]
+    return file_path, title, sections, None
+
+
+def build_index(extracted):
+    """Turn extracted pages into (docs, postings)."""
+    docs = []
+    postings = {}
+
+    def add(term, doc_id, weight):
+        doc_weights = postings.setdefault(term, {})
+        doc_weights[doc_id] = min(MAX_WEIGHT, doc_weights.get(doc_id, 0) + weight)
+
+    for file_path, title, sections in extracted:
+        for position, (anchor, heading, text) in enumerate(sections):
+            doc_id = len(docs)
+            url = f'{file_path}#{anchor}' if anchor else file_path
+            docs.append([url, title, heading, text[:SNIPPET_LENGTH]])
+            if position == 0:
+                for term in tokenize(title):
+                    add(term, doc_id, TITLE_WEIGHT)
+            for term in tokenize(heading):
+                add(term, doc_id, HEADING_WEIGHT)
+            for term in tokenize(text):
+                add(term, doc_id, BODY_WEIGHT)
+    return docs, postings
+
+
+def write_json(path, data):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return payload
+
+
+def write_shards(docs, postings, output_dir=OUTPUT_DIR):
+    """Write term, trigram and doc shards plus the manifest.
+
+    Shards left over from an earlier index are removed afterwards; nothing
+    else in `output_dir` is touched.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    term_shards = {}
+    gram_shards = {}
+    for term in sorted(postings):
+        # Highest-weight documents first, so the client can stop early.
+        ranked = sorted(postings[term].items(), key=lambda item: (-item[1], item[0]))
+        term_shards.setdefault(shard_key(term), {})[term] = [[d, w] for d, w in ranked]
+        for gram in trigrams(term):
+            gram_shards.setdefault(shard_key(gram, GRAM_KEY_LENGTH), {}).setdefault(gram, []).append(term)
+
+    shards = {f't-{key}.json': shard for key, shard in term_shards.items()}
+    shards.update((f'g-{key}.json', shard) for key, shard in gram_shards.items())
+    doc_chunks = (len(docs) + DOC_CHUNK - 1) // DOC_CHUNK
+    for n in range(doc_chunks):
+        shards[f'd-{n}.json'] = docs[n * DOC_CHUNK:(n + 1) * DOC_CHUNK]
+    digest = [write_json(os.path.join(output_dir, name), shard) for name, shard in shards.items()]
+    for name in os.listdir(output_dir):
+        if _SHARD_NAME_RE.fullmatch(name) and name not in shards:
+            os.remove(os.path.join(output_dir, name))
+
+    manifest = {
+        'version': INDEX_VERSION,
+        # Changes whenever any shard does; the client appends it to shard URLs.
+        'rev': hash_bytes(b''.join(digest))[:12],
+        'keyLength': SHARD_KEY_LENGTH,
+        'gramKeyLength': GRAM_KEY_LENGTH,
+        'docChunk': DOC_CHUNK,
+        'docChunks': doc_chunks,
+        'terms': sorted(term_shards),
+        'grams': sorted(gram_shards),
+    }
+    write_json(os.path.join(output_dir, 'manifest.json'), manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the sharded site search index.')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'output directory (default {OUTPUT_DIR})')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    pages = discover_pages()
+    extracted = []
+    failed = False
+    for file_path, title, sections, error in map_pages(extract_page, pages, jobs=args.jobs):
+        if error is not None:
+            print(f"Error processing {file_path}: {error}")
+            failed = True
+            continue
+        extracted.append((file_path, title, sections))
+
+    docs, postings = build_index(extracted)
+    manifest = write_shards(docs, postings, args.output)
+    print(f"Indexed {len(docs)} sections from {len(extracted)} pages: "
+          f"{len(postings)} terms in {len(manifest['terms'])} term shards, "
+          f"{len(manifest['grams'])} trigram shards.")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Generate the offline service worker and its precache manifest.
+
+precache-manifest.json lists every page under PRECACHE_DIRS (plus the home
+page) with a revision taken from the page's content hash, and every
+fingerprinted asset from assets/asset-manifest.json (the hash is already in
+their names, so they carry no revision). A shared nav file
+(see navigation.py) is listed like a page:
+
+    {"revision": "...", "entries": [{"url": "components/button.html", "revision": "1a2b3c4d5e6f"},
+                                    {"url": "assets/css/styles.1a2b3c4d.css", "revision": null}]}
+
+sw.js is rendered from tools/sw-template.js with the manifest's overall
+revision baked in, so browsers see a new worker whenever any entry changes,
+and only refetch the entries whose revision changed. Page hashes are reused
+from the build manifest when the page is unchanged on disk.
+
+Run last, after build_assets.py, sync_docs.py and critical_css.py:
+
+    python tools/build_service_worker.py
+"""
+
+import json
+import os
+
+from build_assets import load_asset_manifest, write_if_changed
+from build_manifest import BuildManifest, hash_file, inputs_key, stat_signature
+from build_search_index import discover_pages
+from navigation import SHARED_NAV_PATH
+
+SW_TEMPLATE = 'tools/sw-template.js'
+SW_PATH = 'sw.js'
+PRECACHE_MANIFEST = 'precache-manifest.json'
+PRECACHE_DIRS = ['components', 'foundations', 'patterns', 'meta']
+REVISION_LENGTH = 12
+
+
+def precache_pages():
+    return [p for p in discover_pages()
+            if p == 'index.html' or p.split('/', 1)[0] in PRECACHE_DIRS]
+
+
+def page_revision(page, manifest):
+    """Content revision of a page, reusing the build manifest's hash if fresh."""
+    entry = manifest.get(page)
+    if entry and entry.get('stat') == stat_signature(page):
+        return entry['hash'][:REVISION_LENGTH]
+    return hash_file(page)[:REVISION_LENGTH]
+
+
+def precache_entries():
+    manifest = BuildManifest().load()
+    entries = [{'url': page, 'revision': page_revision(page, manifest)}
+               for page in precache_pages()]
+    if os.path.exists(SHARED_NAV_PATH):
+        entries.append({'url': SHARED_NAV_PATH, 'revision': hash_file(SHARED_NAV_PATH)[:REVISION_LENGTH]})
+    assets = load_asset_manifest()
+    if assets is None:
+        print("No asset manifest found; run tools/build_assets.py to precache assets.")
+    else:
+        entries.extend({'url': hashed, 'revision': None}
+                       for hashed in sorted(assets['assets'].values()))
+    return entries
+
+
+def main():
+    entries = precache_entries()
+    revision = inputs_key(*(f"{e['url']}:{e['revision']}" for e in entries))[:REVISION_LENGTH]
+    payload = json.dumps({'revision': revision, 'entries': entries}, indent=1) + '\n'
+    changed = write_if_changed(PRECACHE_MANIFEST, payload.encode('utf-8'))
+
+    with open(SW_TEMPLATE, 'r', encoding='utf-8') as f:
+        worker = f.read().replace('__PRECACHE_REVISION__', revision)
+    changed = write_if_changed(SW_PATH, worker.encode('utf-8')) or changed
+
+    state = 'written' if changed else 'unchanged'
+    print(f"{SW_PATH} and {PRECACHE_MANIFEST} {state}: {len(entries)} entries, revision {revision}.")
+
+
+if __name__ == '__main__':
+    main()
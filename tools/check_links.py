@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Check every local link and anchor on the site.
+
+One parallel pass scans every page's start tags, collecting its `id`
+anchors and every href/src with its line number. The results form an
+index of every file on the site plus every anchor per page. Each link is
+then resolved against that index with set lookups:
+
+    components/badge.html:31: broken link 'foundations/color.html' (components/foundations/color.html)
+    index.html:88: missing anchor 'components/button.html#sizes'
+    patterns/cart.html: orphan page (no other page links to it)
+
+External URLs (http:, mailto:, ...) are not checked. Exits non-zero when a
+link is broken or an anchor is missing (with --strict, also when a page is
+orphaned), so it can gate a deploy:
+
+    python tools/check_links.py [--jobs N] [--strict] [--no-orphans]
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import sys
+from html import unescape as html_unescape
+from urllib.parse import unquote, urlsplit
+
+from build_search_index import discover_pages
+from navigation import SHARED_NAV_PATH
+from parallel import add_jobs_argument, map_pages
+
+# Start tags carrying an id/href/src (comments and script/style bodies are
+# skipped, as a browser would), and those attributes inside them.
+TAG_RE = re.compile(r'<!--.*?-->|<(script|style)\b([^>]*)>.*?</\1\s*>'
+                    r'|<[a-zA-Z][^>]*?\s(?:id|href|src)\s*=[^>]*>',
+                    re.DOTALL | re.IGNORECASE)
+ATTR_RE = re.compile(r'''\s(id|href|src)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'<>=&`]+))''',
+                     re.IGNORECASE)
+
+
+def scan_html(html):
+    """Return a page's `id` anchors and its links as (line, url)."""
+    anchors = set()
+    links = []
+    line = 1
+    last = 0
+    for match in TAG_RE.finditer(html):
+        if match.group(1):
+            tag = match.group(2)
+        elif match.group().startswith('<!'):
+            continue
+        else:
+            tag = match.group()
+        line += html.count('\n', last, match.start())
+        last = match.start()
+        for attr in ATTR_RE.finditer(tag):
+            name = attr.group(1).lower()
+            value = next(v for v in attr.group(2, 3, 4) if v is not None)
+            if name == 'id':
+                anchors.add(html_unescape(value))
+            else:
+                links.append((line, html_unescape(value.strip())))
+    return anchors, links
+
+
+def scan_page(file_path):
+    """Return (file_path, anchors, links, error) for one page."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            anchors, links = scan_html(f.read())
+    except Exception as e:
+        return file_path, None, None, str(e)
+    return file_path, anchors, links, None
+
+
+def site_files(root='.'):
+    """Every file on the site as a root-relative '/'-separated path."""
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        files.update(prefix + name for name in filenames)
+    return files
+
+
+def resolve(page, url, files):
+    """Resolve `url` from `page` to (path, fragment), or None if external.
+
+    `path` is root-relative; a directory resolves to its index.html.
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    fragment = unquote(parts.fragment)
+    if not path:
+        return page, fragment
+    if path.startswith('/'):
+        target = path.lstrip('/')
+    else:
+        target = posixpath.join(posixpath.dirname(page), path)
+    target = posixpath.normpath(target)
+    if target == '.':
+        target = 'index.html'
+    elif path.endswith('/') or (target not in files and target + '/index.html' in files):
+        target += '/index.html'
+    return target, fragment
+
+
+class LinkReport:
+    """Problems found by check(), in page order."""
+
+    def __init__(self):
+        self.broken = []            # (page, line, url, target)
+        self.missing_anchors = []   # (page, line, url)
+        self.orphans = []
+        self.errors = []            # (page, message)
+        self.links_checked = 0
+
+    def failed(self, strict=False):
+        return bool(self.broken or self.missing_anchors or self.errors
+                    or (strict and self.orphans))
+
+    def lines(self):
+        for page, message in self.errors:
+            yield f"{page}: error: {message}"
+        for page, line, url, target in self.broken:
+            yield f"{page}:{line}: broken link '{url}' ({target})"
+        for page, line, url in self.missing_anchors:
+            yield f"{page}:{line}: missing anchor '{url}'"
+        for page in self.orphans:
+            yield f"{page}: orphan page (no other page links to it)"
+
+
+def check(pages, files, jobs=1, orphans=True):
+    """Scan `pages` and check their links against `files` and each other."""
+    report = LinkReport()
+    anchors = {}
+    scanned = []
+    for page, page_anchors, links, error in map_pages(scan_page, pages, jobs=jobs):
+        if error is not None:
+            report.errors.append((page, error))
+            continue
+        anchors[page] = page_anchors
+        scanned.append((page, page, links))
+    # A shared nav (navigation.py) links every page from the site root.
+    if SHARED_NAV_PATH in files:
+        _, _, links, error = scan_page(SHARED_NAV_PATH)
+        if error is not None:
+            report.errors.append((SHARED_NAV_PATH, error))
+        else:
+            scanned.append((SHARED_NAV_PATH, 'index.html', links))
+
+    # Most links (the sidebar, shared assets) repeat on every page of a
+    # directory, so each distinct (directory, url) is resolved once.
+    resolved_urls = {}
+    linked = set()
+    for page, base, links in scanned:
+        directory = posixpath.dirname(base)
+        for line, url in links:
+            key = (base if url.startswith('#') else directory, url)
+            resolved = resolved_urls.get(key, False)
+            if resolved is False:
+                resolved = resolved_urls[key] = resolve(base, url, files)
+            if resolved is None:
+                continue
+            report.links_checked += 1
+            target, fragment = resolved
+            if target not in files:
+                report.broken.append((page, line, url, target))
+                continue
+            if target != page:
+                linked.add(target)
+            if fragment and target in anchors and fragment not in anchors[target]:
+                report.missing_anchors.append((page, line, url))
+
+    if orphans:
+        report.orphans = [page for page in anchors if page != 'index.html' and page not in linked]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report broken links, missing anchors and orphan pages.')
+    parser.add_argument('--strict', action='store_true', help='also fail on orphan pages')
+    parser.add_argument('--no-orphans', action='store_true', help='do not report orphan pages')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    pages = discover_pages()
+    report = check(pages, site_files(), jobs=args.jobs, orphans=not args.no_orphans)
+    for line in report.lines():
+        print(line)
+    print(f"Checked {report.links_checked} links on {len(pages)} pages: "
+          f"{len(report.broken)} broken, {len(report.missing_anchors)} missing anchors, "
+          f"{len(report.orphans)} orphans.")
+    if report.failed(args.strict):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Inline each page's critical CSS and load the full stylesheet asynchronously.
+
+styles.css is parsed once into a selector index: every distinct selector is
+reduced to the tags, classes and ids it needs, and filed under one of them
+with the rules that use it. A page's class/tag/id inventory then selects its
+rules by testing only the selectors filed under tokens the page actually
+uses. Each rule is minified once, and the CSS for a set of matched rules is
+cached, so pages that differ only in tokens no rule cares about share it.
+
+The subset goes into a GCC:CRITICAL_CSS region before </head>, followed by a
+preload link for the full stylesheet and a <noscript> fallback. Re-running
+replaces the region in place. Run after build_assets.py and sync_docs.py.
+"""
+
+import os
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+from build_assets import fingerprint_pattern, minify_css
+from regions import RegionIndex, end_marker, start_marker
+from rewrite_engine import Transform, run_cli
+
+STYLESHEET = 'assets/css/styles.css'
+REGION = 'CRITICAL_CSS'
+INDENT = '    '
+
+# Classes script.js adds before first paint; treated as present on every page:
+# the search box injected into the sidebar and the active nav link it marks
+# on pages without a build-time active link.
+RUNTIME_CLASSES = frozenset(['sidebar-search', 'search-input', 'search-results', 'active'])
+
+_PSEUDO_RE = re.compile(r'::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]')
+_TOKEN_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+_COMBINATOR_RE = re.compile(r'\s*[\s>+~]\s*')
+_NOSCRIPT_HREF_RE = re.compile(r'<noscript><link rel="stylesheet" href="([^"]*)">')
+_STYLESHEET_LINK_RE = re.compile(
+    r'[ \t]*<link rel="stylesheet" href="(?P<href>[^"]*?'
+    + fingerprint_pattern(os.path.basename(STYLESHEET)) + r')">[ \t]*\n?')
+
+
+def selector_requirements(selector):
+    """Return the frozenset of tokens ('tag', '.class', '#id') a selector needs.
+
+    Pseudo-classes, pseudo-elements and attribute selectors are ignored, which
+    only ever makes a selector match more pages, never fewer.
+    """
+    required = set()
+    for compound in _COMBINATOR_RE.split(_PSEUDO_RE.sub('', selector.strip())):
+        for prefix, name in _TOKEN_RE.findall(compound):
+            required.add(prefix + (name if prefix else name.lower()))
+    return frozenset(required)
+
+
+def _split_blocks(css):
+    """Yield (prelude, body) for each top-level `prelude { body }` block."""
+    depth = 0
+    start = 0
+    prelude = None
+    for match in re.finditer(r'[{}]', css):
+        if match.group() == '{':
+            if depth == 0:
+                prelude = css[start:match.start()].strip()
+                start = match.end()
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[start:match.start()].strip()
+                start = match.end()
+
+
+class Rule:
+    """One style rule: its selectors, declarations, enclosing @media and CSS text."""
+
+    def __init__(self, selectors, body, media=None):
+        self.selectors = selectors
+        self.body = body
+        self.media = media
+        self.css = f"{','.join(selectors)}{{{body}}}"
+
+
+class StylesheetIndex:
+    """styles.css parsed once into rules plus a token -> selectors index."""
+
+    def __init__(self, css):
+        self.rules = []
+        self.always = set()         # rule ids with a selector needing nothing
+        self.by_token = {}          # token -> {requirements: [rule id, ...]}
+        self._parse(minify_css(css))
+        self._cache = {}
+
+    def _parse(self, css, media=None):
+        for prelude, body in _split_blocks(css):
+            if prelude.startswith('@media'):
+                self._parse(body, media=prelude)
+            elif prelude.startswith('@'):
+                # @font-face, @keyframes and friends are kept wholesale.
+                self.always.add(self._add(Rule([prelude], body, media)))
+            else:
+                selectors = [s.strip() for s in prelude.split(',')]
+                rule_id = self._add(Rule(selectors, body, media))
+                for selector in selectors:
+                    required = selector_requirements(selector)
+                    if not required:
+                        self.always.add(rule_id)
+                        continue
+                    # File under a class or id if there is one: they are far
+                    # more selective than tag names.
+                    token = min(required, key=lambda t: (t[0] not in '.#', t))
+                    rule_ids = self.by_token.setdefault(token, {}).setdefault(required, [])
+                    if rule_id not in rule_ids:
+                        rule_ids.append(rule_id)
+
+    def _add(self, rule):
+        self.rules.append(rule)
+        return len(self.rules) - 1
+
+    def matching_rules(self, inventory):
+        """Ids of the rules any of whose selectors can match `inventory`."""
+        matched = set(self.always)
+        for token in inventory:
+            for required, rule_ids in self.by_token.get(token, {}).items():
+                if required <= inventory:
+                    matched.update(rule_ids)
+        return sorted(matched)
+
+    def critical_css(self, inventory):
+        """Minified CSS for a page inventory, cached per set of matched rules."""
+        rule_ids = tuple(self.matching_rules(inventory))
+        css = self._cache.get(rule_ids)
+        if css is None:
+            out = []
+            media = None
+            for rule_id in rule_ids:
+                rule = self.rules[rule_id]
+                if rule.media != media:
+                    if media is not None:
+                        out.append('}')
+                    if rule.media is not None:
+                        out.append(rule.media + '{')
+                    media = rule.media
+                out.append(rule.css)
+            if media is not None:
+                out.append('}')
+            css = self._cache[rule_ids] = ''.join(out)
+        return css
+
+
+@lru_cache(maxsize=None)
+def load_index(path=STYLESHEET):
+    with open(path, 'r', encoding='utf-8') as f:
+        return StylesheetIndex(f.read())
+
+
+class _InventoryParser(HTMLParser):
+    """Collect every tag, class and id used in a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.tokens = {'.' + c for c in RUNTIME_CLASSES}
+
+    def handle_starttag(self, tag, attrs):
+        self.tokens.add(tag)
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.tokens.update('.' + c for c in value.split())
+            elif name == 'id' and value:
+                self.tokens.add('#' + value)
+
+    handle_startendtag = handle_starttag
+
+
+def page_inventory(html):
+    parser = _InventoryParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tokens
+
+
+def render_region(css, href):
+    """The full GCC:CRITICAL_CSS block, markers included (first line unindented)."""
+    lines = [
+        start_marker(REGION).decode('ascii'),
+        INDENT + f'<style>{css}</style>',
+        INDENT + f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">',
+        INDENT + f'<noscript><link rel="stylesheet" href="{href}"></noscript>',
+        INDENT + end_marker(REGION).decode('ascii'),
+    ]
+    return '\n'.join(lines)
+
+
+def inline_critical_css(content, file_path=None):
+    """Inline the page's critical CSS and make the stylesheet non-blocking."""
+    if '</head>' not in content:
+        return content
+    data = content.encode('utf-8')
+    index = RegionIndex.scan(data)
+    if REGION in index:
+        region = next(r for r in index if r.name == REGION)
+        inner = bytes(index.inner(REGION)).decode('utf-8')
+        href = _NOSCRIPT_HREF_RE.search(inner).group(1)
+        before = data[:region.start].decode('utf-8')
+        after = data[region.end:].decode('utf-8')
+    else:
+        link = _STYLESHEET_LINK_RE.search(content)
+        if link is None:
+            return content
+        href = link.group('href')
+        content = content[:link.start()] + content[link.end():]
+        head_end = content.index('</head>')
+        before = content[:head_end] + INDENT
+        after = '\n' + content[head_end:]
+    # The inventory never includes the region itself, so re-runs are stable.
+    css = load_index().critical_css(page_inventory(before + after))
+    return before + render_region(css, href) + after
+
+
+TRANSFORM = Transform('critical-css', inline_critical_css)
+
+
+def main():
+    run_cli([TRANSFORM], __doc__)
+
+
+if __name__ == '__main__':
+    main()
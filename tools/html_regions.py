@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Find and replace HTML elements by selector in one linear pass.
+
+Pages are tokenized instead of being searched with DOTALL `.*?` regexes, so
+a match always covers exactly one element subtree (nested tags of the same
+name are balanced). The tokenizer never backs up: a tag, comment or quoted
+attribute value left open runs to the end of the document, as in browsers,
+so run time stays linear on any input, malformed or not. Everything outside
+the replaced elements is kept byte-for-byte.
+
+Selectors are deliberately small: `tag`, `.class`, `tag.class.other` or
+`tag#id`. A `has=(selector, text)` filter keeps only elements that contain a
+descendant matching `selector` whose stripped text equals `text`.
+"""
+
+import re
+from functools import lru_cache
+from html import unescape
+
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+])
+
+
+class Selector:
+    """A parsed `tag.class#id` simple selector."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tag = None
+        self.id = None
+        self.classes = set()
+        token = ''
+        kind = 'tag'
+        for ch in text.strip() + '\0':
+            if ch in '.#\0':
+                if token:
+                    if kind == 'tag':
+                        self.tag = token.lower()
+                    elif kind == 'class':
+                        self.classes.add(token)
+                    else:
+                        self.id = token
+                token = ''
+                kind = 'class' if ch == '.' else 'id'
+            else:
+                token += ch
+
+    def matches(self, tag, attrs):
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.id is not None or self.classes:
+            attrs = dict(attrs)
+            if self.id is not None and attrs.get('id') != self.id:
+                return False
+            if not self.classes <= set((attrs.get('class') or '').split()):
+                return False
+        return True
+
+    def __repr__(self):
+        return f"Selector({self.text!r})"
+
+
+# A tag or markup construct that runs to the end of the document is
+# dropped, as browsers do, and scanning stops there. Nothing is ever
+# rescanned, so each character is looked at a bounded number of times.
+_TAG_NAME_RE = re.compile(r'[a-zA-Z][^\t\n\r\f />]*')
+_SPACE_RE = re.compile(r'[\t\n\r\f /]*')
+_ATTR_NAME_RE = re.compile(r'[^\t\n\r\f />][^\t\n\r\f />=]*')
+_EQUALS_RE = re.compile(r'[\t\n\r\f ]*=[\t\n\r\f ]*')
+_UNQUOTED_RE = re.compile(r'[^\t\n\r\f >]*')
+
+# Elements whose content is text up to their own end tag.
+RAW_TEXT_ELEMENTS = frozenset(['script', 'style', 'textarea', 'title'])
+
+
+def _start_tag(html, pos):
+    """Parse a start tag's attributes from `pos`, just past its name.
+
+    Returns (attrs, end, self_closing) with `end` past the closing `>`, or
+    None if the tag is not closed before the end of the document.
+    """
+    attrs = []
+    size = len(html)
+    while True:
+        pos = _SPACE_RE.match(html, pos).end()
+        if pos >= size:
+            return None
+        if html[pos] == '>':
+            return attrs, pos + 1, html[pos - 1] == '/'
+        match = _ATTR_NAME_RE.match(html, pos)
+        name = match.group().lower()
+        pos = match.end()
+        value = None
+        match = _EQUALS_RE.match(html, pos)
+        if match:
+            pos = match.end()
+            if pos >= size:
+                return None
+            quote = html[pos]
+            if quote == '"' or quote == "'":
+                close = html.find(quote, pos + 1)
+                if close == -1:
+                    return None
+                value = html[pos + 1:close]
+                pos = close + 1
+            else:
+                match = _UNQUOTED_RE.match(html, pos)
+                value = match.group()
+                pos = match.end()
+            if '&' in value:
+                value = unescape(value)
+        attrs.append((name, value))
+
+
+def _tokens(html):
+    """Yield ('start', tag, attrs, start, end), ('end', tag, None, start, end)
+    and ('text', None, None, start, end) tokens in document order.
+
+    Comments, doctypes and processing instructions are skipped. Self-closing
+    start tags are reported as ('startend', ...).
+    """
+    size = len(html)
+    text_start = pos = 0
+    while True:
+        lt = html.find('<', pos)
+        if lt == -1 or lt + 1 >= size:
+            break
+        following = html[lt + 1]
+        if following == '!' or following == '?' or following == '/':
+            if html.startswith('<!--', lt):
+                close = html.find('-->', lt + 4)
+                end = close + 3
+            elif following == '/' and (match := _TAG_NAME_RE.match(html, lt + 2)):
+                close = html.find('>', match.end())
+                end = close + 1
+                if close != -1:
+                    if text_start < lt:
+                        yield 'text', None, None, text_start, lt
+                    yield 'end', match.group().lower(), None, lt, end
+                    text_start = pos = end
+                    continue
+            else:
+                close = html.find('>', lt + 2)
+                end = close + 1
+            if close == -1:
+                break
+            if text_start < lt:
+                yield 'text', None, None, text_start, lt
+            text_start = pos = end
+            continue
+
+        match = _TAG_NAME_RE.match(html, lt + 1)
+        if not match:
+            pos = lt + 1
+            continue
+        parsed = _start_tag(html, match.end())
+        if parsed is None:
+            break
+        tag = match.group().lower()
+        attrs, end, self_closing = parsed
+        if text_start < lt:
+            yield 'text', None, None, text_start, lt
+        yield ('startend' if self_closing else 'start'), tag, attrs, lt, end
+        text_start = pos = end
+        if tag in RAW_TEXT_ELEMENTS and not self_closing:
+            match = _raw_text_end(tag).search(html, pos)
+            if not match:
+                break
+            pos = match.start()
+    if text_start < size:
+        yield 'text', None, None, text_start, size
+
+
+@lru_cache(maxsize=None)
+def _raw_text_end(tag):
+    return re.compile(f'</{tag}(?=[\\t\\n\\r\\f />])', re.IGNORECASE)
+
+
+def _find_spans(html, selector, has=None):
+    """Collect (start, end) offsets of the outermost elements matching a selector."""
+    has_selector, has_text = has if has else (None, None)
+    spans = []
+    # State for the element currently being matched.
+    match_start = None
+    match_tag = None
+    match_depth = 0
+    has_found = has is None
+    child_tag = None
+    child_depth = 0
+    child_text = []
+
+    for kind, tag, attrs, start, end in _tokens(html):
+        if kind == 'text':
+            if child_tag is not None:
+                child_text.append(html[start:end])
+            continue
+
+        if kind == 'startend':
+            # Self-closing syntax never opens a subtree.
+            if match_start is None and has_found and selector.matches(tag, attrs):
+                spans.append((start, end))
+            continue
+
+        if kind == 'start':
+            if match_start is None:
+                if selector.matches(tag, attrs):
+                    if tag in VOID_ELEMENTS:
+                        if has_found:
+                            spans.append((start, end))
+                        continue
+                    match_start = start
+                    match_depth = 1
+                    match_tag = tag
+                continue
+
+            if tag == match_tag:
+                match_depth += 1
+
+            if has_found:
+                continue
+            if child_tag is None:
+                if has_selector.matches(tag, attrs) and tag not in VOID_ELEMENTS:
+                    child_tag = tag
+                    child_depth = 1
+                    child_text = []
+            elif tag == child_tag:
+                child_depth += 1
+            continue
+
+        if match_start is None:
+            continue
+
+        if child_tag is not None and tag == child_tag:
+            child_depth -= 1
+            if child_depth == 0:
+                if unescape(''.join(child_text)).strip() == has_text:
+                    has_found = True
+                child_tag = None
+
+        if tag == match_tag:
+            match_depth -= 1
+            if match_depth == 0:
+                if has_found:
+                    spans.append((match_start, end))
+                match_start = None
+                has_found = has_selector is None
+                child_tag = None
+    return spans
+
+
+def find_elements(html, selector, has=None):
+    """Return (start, end) offsets of every outermost element matching `selector`.
+
+    `has` is an optional (selector, text) pair; see the module docstring.
+    Elements left unclosed at the end of the document are ignored.
+    """
+    if isinstance(selector, str):
+        selector = Selector(selector)
+    if has is not None and isinstance(has[0], str):
+        has = (Selector(has[0]), has[1])
+    return _find_spans(html, selector, has)
+
+
+def replace_elements(html, selector, replacement, has=None):
+    """Replace every element matching `selector` with `replacement`.
+
+    `replacement` is a string or a callable receiving the element's outer
+    HTML. Bytes outside the matched elements are copied unchanged.
+    """
+    spans = find_elements(html, selector, has)
+    if not spans:
+        return html
+
+    pieces = []
+    last = 0
+    for start, end in spans:
+        pieces.append(html[last:start])
+        pieces.append(replacement(html[start:end]) if callable(replacement) else replacement)
+        last = end
+    pieces.append(html[last:])
+    return ''.join(pieces)
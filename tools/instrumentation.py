@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Timings, counters and reporting shared by sync_docs.py and the update_* tools.
+
+Code records into the process-wide STATS:
+
+    with STATS.timer('read'):
+        raw = f.read()
+    STATS.count('bytes_in', len(raw))
+
+Worker processes have their own STATS, so a page task ends with
+STATS.take() and returns the snapshot; the parent merges it back with
+STATS.merge(). This works the same for serial runs, where take() simply
+hands the numbers back to the process they came from.
+
+add_arguments() gives a tool --quiet (a progress counter instead of a line
+per file), --profile (run under cProfile; covers the main process only, so
+use it with --jobs 1) and --report FILE (the numbers as JSON, for charting
+across builds). run() applies them around the tool's entry point.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+REPORT_VERSION = 1
+PROFILE_LINES = 25
+PROGRESS_INTERVAL = 0.1
+
+
+class Stats:
+    """Accumulated seconds per phase and named counters."""
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def take(self):
+        """Return everything recorded so far and start again from zero."""
+        snapshot = {'timings': dict(self.timings), 'counters': dict(self.counters)}
+        self.timings.clear()
+        self.counters.clear()
+        return snapshot
+
+    def merge(self, snapshot):
+        for name, seconds in snapshot['timings'].items():
+            self.timings[name] += seconds
+        for name, n in snapshot['counters'].items():
+            self.counters[name] += n
+
+    def as_dict(self):
+        return {
+            'timings': {name: round(seconds, 6) for name, seconds in sorted(self.timings.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+
+STATS = Stats()
+
+
+class Progress:
+    """Per-file output: a line each, or with `quiet` a single updating counter."""
+
+    def __init__(self, total, quiet=False, label='pages'):
+        self.total = total
+        self.quiet = quiet
+        self.label = label
+        self.done = 0
+        self._shown_at = 0.0
+        self._live = quiet and sys.stderr.isatty()
+
+    def step(self, message=None):
+        """One file finished; `message` is printed unless quiet."""
+        self.done += 1
+        if not self.quiet:
+            if message:
+                print(message)
+            return
+        now = time.perf_counter()
+        if self._live and (now - self._shown_at >= PROGRESS_INTERVAL or self.done == self.total):
+            self._shown_at = now
+            sys.stderr.write(f"\r{self.done}/{self.total} {self.label}")
+            sys.stderr.flush()
+
+    def close(self):
+        if self._live and self.done:
+            sys.stderr.write('\n')
+            sys.stderr.flush()
+
+
+def add_arguments(parser):
+    """Add the shared --quiet, --profile and --report options."""
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='show a progress counter instead of a line per file')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help='run under cProfile; print the top functions, or save stats to FILE')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write timings and counters as JSON to FILE')
+
+
+def write_report(path, tool, wall_seconds, extra=None):
+    report = {
+        'version': REPORT_VERSION,
+        'tool': tool,
+        'finished': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'wall_seconds': round(wall_seconds, 6),
+    }
+    report.update(extra or {})
+    report.update(STATS.as_dict())
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+        f.write('\n')
+
+
+def run(args, tool, func, *func_args, **func_kwargs):
+    """Call func(*func_args, **func_kwargs) under the options from add_arguments()."""
+    started = time.perf_counter()
+    if args.profile:
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *func_args, **func_kwargs)
+        if args.profile == '-':
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        else:
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile}")
+    else:
+        result = func(*func_args, **func_kwargs)
+    if args.report:
+        write_report(args.report, tool, time.perf_counter() - started,
+                     {'jobs': getattr(args, 'jobs', 1)})
+    return result
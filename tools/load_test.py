@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Load-test the built site with many concurrent simulated readers.
+
+The URL list comes from the built tree itself: index.html and every page
+under PAGE_DIRS, each with the stylesheets/scripts it references and the
+doc pages it links to. Each simulated reader (an asyncio client on its own
+keep-alive connection) runs sessions: open a random page with its assets,
+then follow --pages-per-session links, the way a reader clicks through the
+sidebar. Every scenario replays the same sessions (same --seed) with
+different client behaviour:
+
+    plain       no cache, no compression
+    gzip        Accept-Encoding: gzip
+    revalidate  gzip, plus a browser cache: fresh (immutable) responses are
+                reused without a request, the rest revalidated with
+                If-None-Match
+    fragments   revalidate, plus instant navigation: after the first page,
+                links to pages at the same depth load
+                assets/fragments/<page>.json instead of the page
+
+For every scenario it reports throughput, and per URL class (index,
+components, ..., css, js, fragment) the requests, 304s, cache hits and
+TTFB / transfer size percentiles. This shows what fingerprinting,
+compression and fragment navigation save.
+
+By default a `tools/serve.py --no-watch` server is started for the run; use
+--url to test a server that is already running. Run after the full build:
+
+    python tools/load_test.py [--clients 50] [--sessions 500] [--output load.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import posixpath
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from build_fragments import OUTPUT_DIR as FRAGMENTS_DIR
+from build_search_index import discover_pages
+from check_links import resolve, scan_html, site_files
+from navigation import SHARED_NAV_PATH
+
+PAGE_DIRS = ['components', 'foundations', 'patterns', 'meta']
+SUBRESOURCE_EXTENSIONS = ('.css', '.js')
+PERCENTILES = (50, 90, 99)
+CONNECT_TIMEOUT = 10
+SERVER_START_TIMEOUT = 10
+
+
+class Scenario:
+    def __init__(self, name, gzip=False, cache=False, fragments=False):
+        self.name = name
+        self.gzip = gzip
+        self.cache = cache
+        self.fragments = fragments
+
+
+SCENARIOS = [
+    Scenario('plain'),
+    Scenario('gzip', gzip=True),
+    Scenario('revalidate', gzip=True, cache=True),
+    Scenario('fragments', gzip=True, cache=True, fragments=True),
+]
+
+
+class SiteMap:
+    """Pages to visit, with each page's subresources and outgoing page links."""
+
+    def __init__(self, pages, assets, links, fragments):
+        self.pages = pages
+        self.assets = assets          # page -> [asset path, ...]
+        self.links = links            # page -> [page, ...]
+        self.fragments = fragments    # page -> fragment path
+
+    @classmethod
+    def crawl(cls):
+        files = site_files()
+        pages = [p for p in discover_pages()
+                 if p == 'index.html' or p.split('/', 1)[0] in PAGE_DIRS]
+        page_set = set(pages)
+        assets = {}
+        links = {}
+        fragments = {}
+        # A shared nav (navigation.py) is fetched by script.js on every page
+        # that has the placeholder; its links are root-relative.
+        nav_links = []
+        if SHARED_NAV_PATH in files:
+            with open(SHARED_NAV_PATH, 'r', encoding='utf-8') as f:
+                nav_links = [resolve('index.html', url, files) for _, url in scan_html(f.read())[1]]
+        for page in pages:
+            with open(page, 'r', encoding='utf-8') as f:
+                html = f.read()
+            _, page_links = scan_html(html)
+            resolved_links = [resolve(page, url, files) for _, url in page_links]
+            if nav_links and 'data-shared-nav=' in html:
+                resolved_links += [(SHARED_NAV_PATH, '')] + nav_links
+            assets[page] = []
+            links[page] = []
+            for resolved in resolved_links:
+                if resolved is None or resolved[0] not in files:
+                    continue
+                target = resolved[0]
+                if target in page_set:
+                    if target != page and target not in links[page]:
+                        links[page].append(target)
+                elif ((target.endswith(SUBRESOURCE_EXTENSIONS) or target == SHARED_NAV_PATH)
+                      and target not in assets[page]):
+                    assets[page].append(target)
+            fragment = posixpath.join(FRAGMENTS_DIR, page + '.json')
+            if fragment in files:
+                fragments[page] = fragment
+        return cls(pages, assets, links, fragments)
+
+
+def url_class(path):
+    if path.startswith(FRAGMENTS_DIR + '/'):
+        return 'fragment'
+    if path.endswith('.html'):
+        return 'index' if '/' not in path else path.split('/', 1)[0]
+    return os.path.splitext(path)[1].lstrip('.') or 'other'
+
+
+def plan_sessions(site, sessions, pages_per_session, seed):
+    """The same click paths for every scenario: [[page, page, ...], ...]."""
+    rng = random.Random(seed)
+    plans = []
+    for _ in range(sessions):
+        page = rng.choice(site.pages)
+        path = [page]
+        for _ in range(pages_per_session - 1):
+            if not site.links[page]:
+                break
+            page = rng.choice(site.links[page])
+            path.append(page)
+        plans.append(path)
+    return plans
+
+
+class Recorder:
+    """Samples per URL class for one scenario."""
+
+    def __init__(self):
+        self.samples = {}   # class -> {'ttfb': [...], 'bytes': [...], 'status': {...}, 'cache_hits': n}
+
+    def _bucket(self, cls):
+        return self.samples.setdefault(cls, {'ttfb': [], 'bytes': [], 'status': {}, 'cache_hits': 0})
+
+    def record(self, cls, status, ttfb, size):
+        bucket = self._bucket(cls)
+        bucket['ttfb'].append(ttfb)
+        bucket['bytes'].append(size)
+        bucket['status'][status] = bucket['status'].get(status, 0) + 1
+
+    def cache_hit(self, cls):
+        self._bucket(cls)['cache_hits'] += 1
+
+
+class Client:
+    """One simulated reader: a keep-alive connection and a browser cache."""
+
+    def __init__(self, host, port, base_path, scenario, recorder):
+        self.host = host
+        self.port = port
+        self.base_path = base_path
+        self.scenario = scenario
+        self.recorder = recorder
+        self.reader = self.writer = None
+        self.cache = {}     # path -> (etag, fresh)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def get(self, path):
+        cls = url_class(path)
+        cached = self.cache.get(path) if self.scenario.cache else None
+        if cached and cached[1]:
+            self.recorder.cache_hit(cls)
+            return
+        headers = [f'GET {self.base_path}{path} HTTP/1.1', f'Host: {self.host}:{self.port}']
+        if self.scenario.gzip:
+            headers.append('Accept-Encoding: gzip')
+        if cached and cached[0]:
+            headers.append(f'If-None-Match: {cached[0]}')
+        request = ('\r\n'.join(headers) + '\r\n\r\n').encode('ascii')
+
+        for attempt in (1, 2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+            started = time.perf_counter()
+            try:
+                self.writer.write(request)
+                await self.writer.drain()
+                status_line = await self.reader.readline()
+                if not status_line:
+                    raise ConnectionResetError('connection closed')
+            except (ConnectionError, OSError):
+                # The server dropped an idle keep-alive connection; retry once.
+                await self.close()
+                if attempt == 2:
+                    raise
+                continue
+            ttfb = time.perf_counter() - started
+            break
+
+        response_headers = {}
+        size = len(status_line)
+        while True:
+            line = await self.reader.readline()
+            size += len(line)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+        length = int(response_headers.get('content-length', 0))
+        if length:
+            await self.reader.readexactly(length)
+            size += length
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+
+        status = int(status_line.split()[1])
+        self.recorder.record(cls, status, ttfb, size)
+        if self.scenario.cache and status in (200, 304):
+            cache_control = response_headers.get('cache-control', '')
+            fresh = 'immutable' in cache_control
+            etag = response_headers.get('etag') or (cached[0] if cached else None)
+            self.cache[path] = (etag, fresh)
+
+    async def load_page(self, site, page):
+        await self.get(page)
+        for asset in site.assets[page]:
+            await self.get(asset)
+
+    async def run_session(self, site, plan):
+        await self.load_page(site, plan[0])
+        # Like script.js: fragments only for pages at the depth of the last
+        # full page load, since the sidebar's relative links must stay valid.
+        depth = plan[0].count('/')
+        for page in plan[1:]:
+            if self.scenario.fragments and page in site.fragments and page.count('/') == depth:
+                await self.get(site.fragments[page])
+            else:
+                await self.load_page(site, page)
+                depth = page.count('/')
+
+
+async def run_scenario(scenario, site, plans, host, port, base_path, clients):
+    recorder = Recorder()
+    queue = asyncio.Queue()
+    for plan in plans:
+        queue.put_nowait(plan)
+
+    async def worker():
+        client = Client(host, port, base_path, scenario, recorder)
+        try:
+            while True:
+                try:
+                    plan = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await client.run_session(site, plan)
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return recorder, time.perf_counter() - started
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0
+    rank = max(0, min(len(values) - 1, round(p / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+def summarize(recorder, elapsed):
+    classes = {}
+    total_requests = total_bytes = 0
+    for cls, bucket in sorted(recorder.samples.items()):
+        ttfb = sorted(bucket['ttfb'])
+        sizes = sorted(bucket['bytes'])
+        requests = len(ttfb)
+        total_requests += requests
+        total_bytes += sum(sizes)
+        classes[cls] = {
+            'requests': requests,
+            'not_modified': bucket['status'].get(304, 0),
+            'errors': sum(n for status, n in bucket['status'].items() if status >= 400),
+            'cache_hits': bucket['cache_hits'],
+            'bytes': sum(sizes),
+            'ttfb_ms': {f'p{p}': round(percentile(ttfb, p) * 1000, 3) for p in PERCENTILES},
+            'size_bytes': {f'p{p}': percentile(sizes, p) for p in PERCENTILES},
+        }
+    return {
+        'seconds': round(elapsed, 4),
+        'requests': total_requests,
+        'bytes': total_bytes,
+        'requests_per_second': round(total_requests / elapsed, 1) if elapsed else 0,
+        'classes': classes,
+    }
+
+
+def print_summary(name, summary):
+    print(f"\n{name}: {summary['requests']} requests in {summary['seconds']:.2f}s "
+          f"({summary['requests_per_second']:.0f} req/s, {summary['bytes'] / 2**20:.1f} MB)")
+    print(f"  {'class':<12} {'reqs':>7} {'304':>6} {'cached':>7} {'MB':>8} "
+          f"{'ttfb p50':>9} {'p90':>7} {'p99':>7} {'size p50':>9} {'p90':>8} {'p99':>8}")
+    for cls, row in summary['classes'].items():
+        ttfb, sizes = row['ttfb_ms'], row['size_bytes']
+        print(f"  {cls:<12} {row['requests']:>7} {row['not_modified']:>6} {row['cache_hits']:>7} "
+              f"{row['bytes'] / 2**20:>8.2f} {ttfb['p50']:>7.2f}ms {ttfb['p90']:>5.2f}ms "
+              f"{ttfb['p99']:>5.2f}ms {sizes['p50']:>9} {sizes['p90']:>8} {sizes['p99']:>8}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server():
+    """Start `tools/serve.py --no-watch` on a free port; returns (process, url)."""
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, 'tools/serve.py', '--no-watch', '--port', str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return proc, f'http://127.0.0.1:{port}/'
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+    proc.kill()
+    raise SystemExit('tools/serve.py did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay reading sessions against the built site.')
+    parser.add_argument('--url', help='test this running server instead of starting tools/serve.py')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent readers (default 50)')
+    parser.add_argument('--sessions', type=int, default=500, help='sessions per scenario (default 500)')
+    parser.add_argument('--pages-per-session', type=int, default=5, help='pages per session (default 5)')
+    parser.add_argument('--scenario', nargs='+', choices=[s.name for s in SCENARIOS],
+                        help='run only these scenarios')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the session plans')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    site = SiteMap.crawl()
+    if not site.pages:
+        raise SystemExit('No pages found; run from the site root after building.')
+    plans = plan_sessions(site, args.sessions, args.pages_per_session, args.seed)
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server()
+    parts = urlsplit(url)
+    base_path = parts.path if parts.path.endswith('/') else parts.path + '/'
+    print(f"{len(site.pages)} pages, {len(plans)} sessions x {len(scenarios)} scenarios, "
+          f"{args.clients} clients against {url}")
+
+    results = {'url': url, 'clients': args.clients, 'sessions': len(plans), 'scenarios': {}}
+    try:
+        for scenario in scenarios:
+            recorder, elapsed = asyncio.run(run_scenario(
+                scenario, site, plans, parts.hostname, parts.port or 80, base_path, args.clients))
+            summary = results['scenarios'][scenario.name] = summarize(recorder, elapsed)
+            print_summary(scenario.name, summary)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+            f.write('\n')
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+The site navigation, defined once in tools/data/nav.json.
+
+nav.json holds a list of sections. A section is either a top-level link
+({"href", "label"}) or a titled group ({"title", "items"}); an item is a
+link or a titled subsection with its own "items". Hrefs are relative to the
+site root and labels are HTML.
+
+render_nav() turns it into the sidebar <nav> for a given page, with links
+made relative to the page and the page's own link marked `active` with
+aria-current="page", so the client does no work to highlight it.
+
+With "shared": true at the top of nav.json the nav is instead written once,
+with root-relative links, to SHARED_NAV_PATH, and render_sidebar() gives
+each page a placeholder that script.js fills from that file (marking the
+active link itself), with a short list of section links in <noscript>.
+Editing the nav then rewrites one file rather than every page, and browsers
+download it once per change instead of once per page.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from build_assets import write_if_changed
+from build_manifest import hash_bytes, hash_file
+
+NAV_PATH = 'tools/data/nav.json'
+SHARED_NAV_PATH = 'assets/nav/nav.html'
+NAV_INDENT = ' ' * 12
+STEP = '    '
+
+LINK_CLASS = ' class="nav-link"'
+ACTIVE_LINK_CLASS = ' class="nav-link active" aria-current="page"'
+
+
+@lru_cache(maxsize=None)
+def load_nav_data(path=NAV_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_nav(path=NAV_PATH):
+    return load_nav_data(path)['sections']
+
+
+def is_shared(path=NAV_PATH):
+    """True if pages load the nav from SHARED_NAV_PATH instead of embedding it."""
+    return bool(load_nav_data(path).get('shared'))
+
+
+def nav_hash(path=NAV_PATH):
+    """Content hash of the nav data, for build inputs keys."""
+    return hash_file(path)
+
+
+def normalize_page(page):
+    """'./components/x.html' -> 'components/x.html' on every platform."""
+    return os.path.normpath(page).replace(os.sep, '/')
+
+
+def root_prefix(page):
+    """'../' per directory level of `page` (a normalized root-relative path)."""
+    return '../' * page.count('/')
+
+
+def _anchor(lines, pieces, links, root, item):
+    """Emit an `<a>`, keeping its class attribute as a separate, swappable piece."""
+    lines.append(f'<a href="{root}{item["href"]}"')
+    _flush(lines, pieces)
+    links[item['href']] = len(pieces)
+    pieces.append(LINK_CLASS)
+    lines.append(f'>{item["label"]}</a>')
+
+
+def _flush(lines, pieces):
+    pieces.append(''.join(lines))
+    lines.clear()
+
+
+def _items(lines, pieces, links, depth, root, items, list_class):
+    lines.append(f'{STEP * depth}<ul class="{list_class}">\n')
+    for item in items:
+        if 'items' in item:
+            lines.append(f'{STEP * (depth + 1)}<li class="nav-subsection">\n')
+            lines.append(f'{STEP * (depth + 2)}<span class="nav-subsection-title">{item["title"]}</span>\n')
+            _items(lines, pieces, links, depth + 2, root, item['items'], 'nav-subsublist')
+            lines.append(f'{STEP * (depth + 1)}</li>\n')
+        else:
+            lines.append(f'{STEP * (depth + 1)}<li>')
+            _anchor(lines, pieces, links, root, item)
+            lines.append('</li>\n')
+    lines.append(f'{STEP * depth}</ul>\n')
+
+
+@lru_cache(maxsize=None)
+def _compile(root, indent, path=NAV_PATH, translate=None):
+    """Pre-render the nav for one root prefix.
+
+    Returns (pieces, links): the output split around every link's class
+    attribute, and href -> index of that attribute in `pieces`. `translate`,
+    if given, maps each piece's text to another locale (build_locales.py).
+    """
+    pieces = []
+    links = {}
+    lines = ['<nav class="sidebar-nav">\n', f'{STEP}<ul class="nav-list">\n']
+    for section in load_nav(path):
+        lines.append(f'{STEP * 2}<li class="nav-section">\n')
+        if 'items' in section:
+            lines.append(f'{STEP * 3}<span class="nav-section-title">{section["title"]}</span>\n')
+            _items(lines, pieces, links, 3, root, section['items'], 'nav-sublist')
+        else:
+            lines.append(STEP * 3)
+            _anchor(lines, pieces, links, root, section)
+            lines.append('\n')
+        lines.append(f'{STEP * 2}</li>\n')
+    lines.append(f'{STEP}</ul>\n')
+    lines.append('</nav>')
+    _flush(lines, pieces)
+    if translate is not None:
+        pieces = [translate(piece) for piece in pieces]
+    if indent:
+        pieces = [piece.replace('\n', '\n' + indent) for piece in pieces]
+        pieces[0] = indent + pieces[0]
+    return pieces, links
+
+
+def render_nav(page, indent=NAV_INDENT, path=NAV_PATH, translate=None):
+    """Return the sidebar <nav> for `page` with its own link marked active."""
+    page = normalize_page(page)
+    pieces, links = _compile(root_prefix(page), indent, path, translate)
+    active = links.get(page)
+    if active is None:
+        return ''.join(pieces)
+    pieces = list(pieces)
+    pieces[active] = ACTIVE_LINK_CLASS
+    return ''.join(pieces)
+
+
+def render_shared_nav(path=NAV_PATH, translate=None):
+    """The nav with root-relative links and nothing active, for SHARED_NAV_PATH."""
+    html = ''.join(_compile('', '', path, translate)[0])
+    version = hash_bytes(html.encode('utf-8'))[:8]
+    return html.replace('<nav class="sidebar-nav">', f'<nav class="sidebar-nav" data-nav-version="{version}">', 1)
+
+
+def _section_link(section):
+    """The link standing in for a section in the <noscript> fallback."""
+    if 'items' not in section:
+        return section
+    first = section['items'][0]
+    while 'items' in first:
+        first = first['items'][0]
+    return {'href': first['href'], 'label': section['title']}
+
+
+@lru_cache(maxsize=None)
+def _placeholder(root, path=NAV_PATH, translate=None):
+    lines = [f'<nav class="sidebar-nav" data-shared-nav="{root}{SHARED_NAV_PATH}">\n',
+             f'{STEP}<noscript>\n', f'{STEP * 2}<ul class="nav-list">\n']
+    for section in load_nav(path):
+        link = _section_link(section)
+        lines.append(f'{STEP * 3}<li class="nav-section"><a href="{root}{link["href"]}"{LINK_CLASS}>'
+                     f'{link["label"]}</a></li>\n')
+    lines += [f'{STEP * 2}</ul>\n', f'{STEP}</noscript>\n', '</nav>']
+    html = ''.join(lines)
+    return html if translate is None else translate(html)
+
+
+def render_sidebar(page, indent=NAV_INDENT, path=NAV_PATH, translate=None):
+    """What goes in a page's SIDEBAR region: the nav, or in shared mode its placeholder."""
+    if not is_shared(path):
+        return render_nav(page, indent, path, translate)
+    html = _placeholder(root_prefix(normalize_page(page)), path, translate)
+    if indent:
+        html = indent + html.replace('\n', '\n' + indent)
+    return html
+
+
+def shared_nav_bytes(path=NAV_PATH, translate=None):
+    """Contents of SHARED_NAV_PATH, or None when the nav is not shared."""
+    if not is_shared(path):
+        return None
+    return (render_shared_nav(path, translate) + '\n').encode('utf-8')
+
+
+def write_shared_nav(path=NAV_PATH, output=SHARED_NAV_PATH):
+    """Write (or, when the nav is not shared, remove) the shared nav file.
+
+    Returns True if the file changed.
+    """
+    data = shared_nav_bytes(path)
+    if data is None:
+        if os.path.exists(output):
+            os.remove(output)
+            return True
+        return False
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    return write_if_changed(output, data)
+
+
+def clear_cache():
+    """Forget loaded and pre-rendered nav data (after nav.json changes)."""
+    load_nav_data.cache_clear()
+    _compile.cache_clear()
+    _placeholder.cache_clear()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Per-page header metadata for sync_docs.py.
+
+Two JSON files:
+
+    tools/data/page-metadata.json
+        hand-edited: status, owner, Figma/implementation URLs and
+        last-reviewed date, as "defaults" plus per-page overrides keyed by
+        page path.
+    .gcc-build/page-history.json
+        maintained by sync: for every page, the hash of its own body content
+        (GCC regions and asset fingerprints excluded) and the date it last
+        changed. Without it, a page's date is adopted from its rendered header.
+
+"Last updated" therefore only moves when a page's own content does, and two
+consecutive syncs render byte-identical headers.
+"""
+
+import json
+import os
+import re
+from datetime import date
+
+from build_assets import ASSETS, compile_asset_rewriter
+from build_manifest import hash_bytes
+from regions import RegionIndex
+
+METADATA_PATH = 'tools/data/page-metadata.json'
+HISTORY_PATH = '.gcc-build/page-history.json'
+
+DEFAULTS = {
+    'status': 'Stable',
+    'owner': 'GCC Design System',
+    'figma_url': '#',
+    'implementation_url': '#',
+    'last_reviewed': None,
+}
+
+# Used once to adopt the date already rendered in a page without history.
+_RENDERED_DATE_RE = re.compile(rb'<strong>Last updated:</strong> (\d{4}-\d{2}-\d{2})<')
+
+# Maps fingerprinted asset references back to their source names.
+_unfingerprint = compile_asset_rewriter({path: path for path in ASSETS})
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except OSError:
+        return {}
+    except ValueError as e:
+        print(f"Ignoring malformed {path}: {e}")
+        return {}
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def content_hash(raw):
+    """Hash of a page's own content, ignoring everything the build generates.
+
+    Only the <body> counts: <head> is rewritten by the asset and critical CSS
+    passes. GCC regions are emptied and asset fingerprints normalized.
+    """
+    body = raw.find(b'<body')
+    index = RegionIndex.scan(raw[body:] if body != -1 else raw)
+    stripped = index.splice({name: b'' for name in index.names()})
+    return hash_bytes(_unfingerprint(bytes(stripped)))
+
+
+class PageMetadata:
+    """Editorial metadata: defaults plus per-page overrides."""
+
+    def __init__(self, defaults=None, pages=None):
+        self.defaults = dict(DEFAULTS, **(defaults or {}))
+        self.pages = pages or {}
+
+    @classmethod
+    def load(cls, path=METADATA_PATH):
+        data = _read_json(path)
+        return cls(data.get('defaults'), data.get('pages'))
+
+    def get(self, page):
+        return dict(self.defaults, **self.pages.get(page, {}))
+
+    def signature(self, page):
+        """Stable string that changes whenever `page`'s metadata does."""
+        return json.dumps(self.get(page), sort_keys=True)
+
+
+class PageHistory:
+    """page -> {'hash': content hash, 'last_updated': 'YYYY-MM-DD'}."""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.pages = {}
+        self.dirty = False
+
+    def load(self):
+        self.pages = _read_json(self.path)
+        return self
+
+    def save(self):
+        if self.dirty:
+            _write_json(self.path, self.pages)
+            self.dirty = False
+
+    def last_updated(self, page, digest, raw=None):
+        """Date for `page` given its current content hash (not recorded)."""
+        entry = self.pages.get(page)
+        if entry and entry['hash'] == digest:
+            return entry['last_updated']
+        if entry is None and raw is not None:
+            match = _RENDERED_DATE_RE.search(raw)
+            if match:
+                return match.group(1).decode('ascii')
+        return date.today().isoformat()
+
+    def record(self, page, digest, last_updated):
+        entry = {'hash': digest, 'last_updated': last_updated}
+        if self.pages.get(page) != entry:
+            self.pages[page] = entry
+            self.dirty = True
+
+    def prune(self, keep):
+        keep = set(keep)
+        for page in list(self.pages):
+            if page not in keep:
+                del self.pages[page]
+                self.dirty = True
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Page-weight report and budgets.
+
+Measures every page's raw and gzipped size and splits it into bytes inside
+GCC marker regions (sidebar, header, critical CSS, ...) and the page's own
+content. Pages that carry the sidebar nav or component header inline,
+without markers, have those blocks counted under the region that would
+hold them (INLINE_REGIONS). A region's gzip cost is how much smaller the compressed page gets
+without it. Across the site it then shows, per region, how many bytes are
+repeated copies of the same partial: everything beyond one copy of each
+region per site, which is what a shared, cached fragment would save.
+
+Budgets live in tools/data/page-budgets.json, in bytes, per section (the
+page's top-level directory, or "index" for index.html) over "defaults":
+
+    {"defaults": {"raw": 49152, "gzip": 12288}, "sections": {"foundations": {"raw": 81920}}}
+
+A page over its budget is listed and the exit status is 1:
+
+    python tools/page_weight.py [--top 10] [--json report.json] [--jobs N]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+
+from build_manifest import hash_bytes
+from build_search_index import discover_pages
+from html_regions import find_elements
+from parallel import add_jobs_argument, map_pages
+from regions import RegionIndex
+
+BUDGETS_PATH = 'tools/data/page-budgets.json'
+GZIP_LEVEL = 6
+BUDGET_METRICS = ('raw', 'gzip')
+
+# Region name -> the element it holds, for pages that inline it without markers.
+INLINE_REGIONS = {
+    'SIDEBAR': 'nav.sidebar-nav',
+    'HEADER': 'div.component-header',
+}
+
+
+def gzip_size(data):
+    return len(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+
+
+def section(page):
+    return page.split('/', 1)[0] if '/' in page else 'index'
+
+
+def region_spans(raw, page):
+    """(name, start, end) byte spans of a page's GCC regions and inline blocks."""
+    spans = [(region.name, region.start, region.end) for region in RegionIndex.scan(raw, page)]
+    missing = [(name, selector) for name, selector in INLINE_REGIONS.items()
+               if name not in {span[0] for span in spans}]
+    if missing:
+        html = raw.decode('utf-8')
+        for name, selector in missing:
+            for start, end in find_elements(html, selector)[:1]:
+                start_byte = len(html[:start].encode('utf-8'))
+                spans.append((name, start_byte, start_byte + len(html[start:end].encode('utf-8'))))
+    return spans
+
+
+def measure_page(page):
+    """Return (page, measurements, error) for one page."""
+    try:
+        with open(page, 'rb') as f:
+            raw = f.read()
+        compressed = gzip_size(raw)
+        regions = {}
+        for name, start, end in region_spans(raw, page):
+            data = raw[start:end]
+            without = raw[:start] + raw[end:]
+            regions[name] = {
+                'raw': len(data),
+                'gzip': compressed - gzip_size(without),
+                'hash': hash_bytes(data),
+            }
+    except Exception as e:
+        return page, None, str(e)
+    in_regions = sum(r['raw'] for r in regions.values())
+    return page, {
+        'raw': len(raw),
+        'gzip': compressed,
+        'regions': regions,
+        'unique': len(raw) - in_regions,
+    }, None
+
+
+class Budgets:
+    def __init__(self, defaults=None, sections=None):
+        self.defaults = defaults or {}
+        self.sections = sections or {}
+
+    @classmethod
+    def load(cls, path=BUDGETS_PATH):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls(data.get('defaults'), data.get('sections'))
+
+    def for_page(self, page):
+        budget = dict(self.defaults)
+        budget.update(self.sections.get(section(page), {}))
+        return budget
+
+    def violations(self, page, weights):
+        budget = self.for_page(page)
+        return [(metric, weights[metric], budget[metric])
+                for metric in BUDGET_METRICS
+                if budget.get(metric) is not None and weights[metric] > budget[metric]]
+
+
+def region_totals(pages):
+    """Per region name: pages, total bytes, distinct variants and repeated bytes."""
+    totals = {}
+    for weights in pages.values():
+        for name, region in weights['regions'].items():
+            total = totals.setdefault(name, {'pages': 0, 'raw': 0, 'gzip': 0, 'variants': {}})
+            total['pages'] += 1
+            total['raw'] += region['raw']
+            total['gzip'] += region['gzip']
+            total['variants'][region['hash']] = region['raw']
+    for total in totals.values():
+        largest = max(total['variants'].values())
+        total['repeated'] = total['raw'] - largest
+        total['variants'] = len(total['variants'])
+    return totals
+
+
+def build_report(pages, budgets):
+    regions = region_totals(pages)
+    over = {page: violations for page, weights in pages.items()
+            if (violations := budgets.violations(page, weights))}
+    raw = sum(w['raw'] for w in pages.values())
+    return {
+        'pages': pages,
+        'regions': regions,
+        'site': {
+            'pages': len(pages),
+            'raw': raw,
+            'gzip': sum(w['gzip'] for w in pages.values()),
+            'in_regions': raw - sum(w['unique'] for w in pages.values()),
+            'repeated': sum(r['repeated'] for r in regions.values()),
+        },
+        'over_budget': {page: [{'metric': m, 'size': s, 'budget': b} for m, s, b in v]
+                        for page, v in over.items()},
+    }
+
+
+def print_report(report, top):
+    pages = sorted(report['pages'].items(), key=lambda item: item[1]['raw'], reverse=True)
+    shown = pages if top is None else pages[:top]
+    width = max([len(page) for page, _ in shown] + [4])
+    print(f"{'page':<{width}} {'raw':>9} {'gzip':>8} {'regions':>9} {'unique':>9}")
+    for page, w in shown:
+        print(f"{page:<{width}} {w['raw']:>9,} {w['gzip']:>8,} "
+              f"{w['raw'] - w['unique']:>9,} {w['unique']:>9,}")
+    if len(shown) < len(pages):
+        print(f"... and {len(pages) - len(shown)} smaller pages (--top 0 to list all)")
+
+    if report['regions']:
+        print(f"\n{'region':<{width}} {'pages':>9} {'raw':>11} {'gzip cost':>10} {'variants':>9} {'repeated':>11}")
+        for name, r in sorted(report['regions'].items(), key=lambda item: item[1]['raw'], reverse=True):
+            print(f"{name:<{width}} {r['pages']:>9} {r['raw']:>11,} {r['gzip']:>10,} "
+                  f"{r['variants']:>9} {r['repeated']:>11,}")
+
+    site = report['site']
+    share = site['in_regions'] / site['raw'] if site['raw'] else 0
+    print(f"\n{site['pages']} pages: {site['raw']:,} bytes raw, {site['gzip']:,} gzipped. "
+          f"{site['in_regions']:,} bytes ({share:.0%}) are in regions, "
+          f"{site['repeated']:,} of them repeated copies of the same partial.")
+
+    for page, violations in report['over_budget'].items():
+        for v in violations:
+            print(f"Over budget: {page}: {v['metric']} {v['size']:,} > {v['budget']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report page weight and enforce per-section budgets.')
+    parser.add_argument('--budgets', default=BUDGETS_PATH, help=f'budgets file (default {BUDGETS_PATH})')
+    parser.add_argument('--top', type=int, default=10, help='list the N largest pages (0 = all, default 10)')
+    parser.add_argument('--json', metavar='FILE', help='also write the full report as JSON')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    pages = {}
+    failed = False
+    for page, weights, error in map_pages(measure_page, discover_pages(), jobs=args.jobs):
+        if error is not None:
+            print(f"Error processing {page}: {error}")
+            failed = True
+            continue
+        pages[page] = weights
+
+    report = build_report(pages, Budgets.load(args.budgets))
+    print_report(report, args.top or None)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+    if failed or report['over_budget']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Process-pool helpers for the page tools.
+
+Workers are primed once through an initializer (partials, compiled patterns,
+transforms) so each task only carries a page path. Results always come back
+in input order, so output and exit status match a serial run.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs/-j option to an argparse parser."""
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='process pages across N worker processes (0 = one per CPU)')
+
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a concrete worker count."""
+    if jobs is None or jobs < 0:
+        return 1
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def map_pages(func, items, jobs=1, initializer=None, initargs=()):
+    """Return [func(item) for item in items], optionally across a process pool.
+
+    `initializer(*initargs)` runs once per worker (or once in-process for a
+    serial run). `func` should catch its own per-page errors and return them
+    as part of its result so one bad page cannot abort the others.
+    """
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), len(items))
+
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(item) for item in items]
+
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer,
+                             initargs=initargs) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Index and splice the `<!-- GCC:<NAME>_START -->` / `<!-- GCC:<NAME>_END -->`
+marker regions that sync_docs.py injects partials into.
+
+A page is scanned once for every marker. The index records the byte offsets
+of each named region, rejecting duplicated, unbalanced or overlapping
+markers instead of silently producing a broken page. Splicing builds the
+output from memoryview slices of the original bytes and a single join, so a
+page is copied exactly once no matter how many regions are replaced.
+"""
+
+import re
+
+from instrumentation import STATS
+
+MARKER_RE = re.compile(rb'<!-- GCC:([A-Z0-9_]+?)_(START|END) -->')
+
+
+class RegionError(ValueError):
+    """Raised when a page's GCC markers are duplicated or badly nested."""
+
+
+def start_marker(name):
+    return f'<!-- GCC:{name}_START -->'.encode('ascii')
+
+
+def end_marker(name):
+    return f'<!-- GCC:{name}_END -->'.encode('ascii')
+
+
+class Region:
+    """Offsets of one named region.
+
+    `start`/`end` delimit the whole region including both markers;
+    `inner_start`/`inner_end` delimit the content between them.
+    """
+
+    __slots__ = ('name', 'start', 'inner_start', 'inner_end', 'end')
+
+    def __init__(self, name, start, inner_start, inner_end, end):
+        self.name = name
+        self.start = start
+        self.inner_start = inner_start
+        self.inner_end = inner_end
+        self.end = end
+
+    def __repr__(self):
+        return f"Region({self.name!r}, {self.inner_start}:{self.inner_end})"
+
+
+class RegionIndex:
+    """All GCC marker regions of one page, in document order."""
+
+    def __init__(self, data, regions):
+        self.data = data
+        self.regions = regions
+        self.by_name = {r.name: r for r in regions}
+
+    @classmethod
+    def scan(cls, data, source=None):
+        """Index every marker region in `data` (bytes) in a single pass.
+
+        `source` (e.g. the page path) prefixes error messages when given.
+        """
+        prefix = f"{source}: " if source else ''
+        regions = []
+        open_name = open_start = open_inner = None
+        seen = set()
+        for match in MARKER_RE.finditer(data):
+            name = match.group(1).decode('ascii')
+            if match.group(2) == b'START':
+                if open_name is not None:
+                    raise RegionError(f"{prefix}GCC:{name}_START inside unclosed "
+                                      f"GCC:{open_name} region (regions cannot nest)")
+                if name in seen:
+                    raise RegionError(f"{prefix}duplicate GCC:{name} region")
+                open_name, open_start, open_inner = name, match.start(), match.end()
+            else:
+                if open_name != name:
+                    expected = f"GCC:{open_name}_END" if open_name else "a START marker"
+                    raise RegionError(f"{prefix}unexpected GCC:{name}_END (expected {expected})")
+                regions.append(Region(name, open_start, open_inner, match.start(), match.end()))
+                seen.add(name)
+                open_name = None
+        if open_name is not None:
+            raise RegionError(f"{prefix}GCC:{open_name}_START has no matching END marker")
+        STATS.count('region_markers', 2 * len(regions))
+        return cls(data, regions)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __iter__(self):
+        return iter(self.regions)
+
+    def names(self):
+        return [r.name for r in self.regions]
+
+    def inner(self, name):
+        """Return a zero-copy view of a region's current content."""
+        region = self.by_name[name]
+        return memoryview(self.data)[region.inner_start:region.inner_end]
+
+    def splice(self, replacements):
+        """Return the page with region contents replaced.
+
+        `replacements` maps region names to new inner content (bytes). Each
+        new content is wrapped in newlines, matching what sync has always
+        written. Regions not in the mapping are copied unchanged.
+        """
+        view = memoryview(self.data)
+        pieces = []
+        last = 0
+        for region in self.regions:
+            content = replacements.get(region.name)
+            if content is None:
+                continue
+            pieces.append(view[last:region.inner_start])
+            pieces.append(b'\n')
+            pieces.append(content)
+            pieces.append(b'\n')
+            last = region.inner_end
+        if not pieces:
+            return self.data
+        pieces.append(view[last:])
+        return b''.join(pieces)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Single-pass rewrite engine shared by the update_* tools.
+
+Files are discovered once, each page is read once, every registered transform
+runs over the in-memory content in order, and the page is written back at most
+once -- only if some transform actually changed it.
+"""
+
+import argparse
+import os
+import sys
+
+import instrumentation
+from instrumentation import STATS, Progress
+from parallel import add_jobs_argument, map_pages
+
+# Doc page folders. Anything else (build_locales.py output, tools/partials,
+# ...) is not a source page and is never rewritten.
+TARGET_DIRS = ['components', 'foundations', 'patterns', 'product-specific', 'meta']
+
+
+class Transform:
+    """A named in-memory page rewrite.
+
+    `apply(content, file_path)` returns the new content. `applies_to(file_path)`
+    optionally restricts the transform to a subset of pages.
+    """
+
+    def __init__(self, name, apply, applies_to=None):
+        self.name = name
+        self.apply = apply
+        self.applies_to = applies_to
+
+    def wants(self, file_path):
+        return self.applies_to is None or self.applies_to(file_path)
+
+    def __repr__(self):
+        return f"Transform({self.name!r})"
+
+
+def discover_html_files(root='.'):
+    """Return every .html file under `root` (relative, '/'-separated, sorted)."""
+    html_files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Skip .git, build caches and other hidden directories.
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in filenames:
+            if filename.endswith('.html'):
+                path = os.path.relpath(os.path.join(dirpath, filename), root)
+                html_files.append(path.replace(os.sep, '/'))
+    return sorted(html_files)
+
+
+def discover_pages(root='.'):
+    """index.html plus every page under TARGET_DIRS, including subfolders."""
+    return [p for p in discover_html_files(root)
+            if p == 'index.html' or p.split('/', 1)[0] in TARGET_DIRS]
+
+
+def apply_transforms(content, file_path, transforms):
+    """Run `transforms` in order over `content`.
+
+    Returns the new content and the names of the transforms that changed it.
+    """
+    changed_by = []
+    for transform in transforms:
+        if not transform.wants(file_path):
+            continue
+        with STATS.timer(f'transform:{transform.name}'):
+            new_content = transform.apply(content, file_path)
+        if new_content != content:
+            STATS.count(f'changed:{transform.name}')
+            changed_by.append(transform.name)
+            content = new_content
+    return content, changed_by
+
+
+def rewrite_file(file_path, transforms):
+    """Read, transform and (if changed) write a single page.
+
+    Returns the list of transform names that changed the page.
+    """
+    with STATS.timer('read'), open(file_path, 'r', encoding='utf-8') as f:
+        original_content = f.read()
+    STATS.count('bytes_in', len(original_content))
+
+    content, changed_by = apply_transforms(original_content, str(file_path), transforms)
+    # Later transforms may undo earlier ones; only a real change counts.
+    if content == original_content:
+        changed_by = []
+
+    if changed_by:
+        with STATS.timer('write'), open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        STATS.count('bytes_out', len(content))
+        STATS.count('pages_written')
+    else:
+        STATS.count('pages_unchanged')
+    return changed_by
+
+
+# Installed once per worker process by _init_worker.
+_worker_transforms = []
+_worker_root = '.'
+
+
+def _init_worker(transforms, root):
+    global _worker_transforms, _worker_root
+    _worker_transforms = transforms
+    _worker_root = root
+
+
+def _rewrite_task(file_path):
+    """Worker entry point: rewrite one page.
+
+    Returns (path, changed_by, error, stats snapshot).
+    """
+    try:
+        changed_by = rewrite_file(os.path.join(_worker_root, file_path), _worker_transforms)
+    except Exception as e:
+        return file_path, [], str(e), STATS.take()
+    return file_path, changed_by, None, STATS.take()
+
+
+def run_pipeline(transforms, files=None, root='.', jobs=1, quiet=False):
+    """Apply `transforms` to every doc page under `root` in one pass.
+
+    With jobs > 1 pages are spread across a process pool; results are still
+    reported in discovery order. Returns (updated, errors) where `updated` is
+    a list of (file_path, changed_by) for the pages that were written and
+    `errors` a list of (file_path, message).
+    """
+    with STATS.timer('discover'):
+        if files is None:
+            files = discover_pages(root)
+        files = [f for f in files if any(t.wants(f) for t in transforms)]
+
+    results = map_pages(_rewrite_task, files, jobs=jobs,
+                        initializer=_init_worker, initargs=(transforms, root))
+
+    updated = []
+    errors = []
+    progress = Progress(len(files), quiet)
+    for file_path, changed_by, error, stats in results:
+        STATS.merge(stats)
+        if error is not None:
+            errors.append((file_path, error))
+            print(f"Error processing {file_path}: {error}")
+            progress.step()
+        elif changed_by:
+            updated.append((file_path, changed_by))
+            progress.step(f"Updated: {file_path} ({', '.join(changed_by)})")
+        else:
+            progress.step()
+    progress.close()
+
+    print(f"\nUpdated {len(updated)} files.")
+    return updated, errors
+
+
+def run_cli(transforms, description=None):
+    """Shared command line for the update_* scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    add_jobs_argument(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    tool = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    _, errors = instrumentation.run(args, tool, run_pipeline, transforms,
+                                    jobs=args.jobs, quiet=args.quiet)
+    if errors:
+        sys.exit(1)
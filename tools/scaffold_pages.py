@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Scaffold doc pages from the page registry in tools/data/registry.json.
+
+The registry maps page paths to their title and content, with per-directory
+defaults for anything a page leaves out:
+
+    {"defaults": {"components": {"header": true, "description": "... {title} ...",
+                                 "sections": [{"heading": "Overview", "text": "..."}]}},
+     "pages": {"components/accordion.html": {"title": "Accordion"},
+               "foundations/effects.html": {"title": "Effects", "description": "...",
+                                            "sections": [{"heading": "Usage Guidelines",
+                                                          "do": ["..."], "dont": ["..."]}]}}}
+
+Default descriptions and section texts may use `{title}`. An entry can also
+set "ui_title" (the <h1>, defaults to the title) and "header" (whether the
+page gets a GCC:HEADER region).
+
+Pages are rendered from one compiled template and then through the same
+region and asset rendering as sync_docs.py, so a fresh page is already what
+sync would write. Only missing pages are created; a scaffolded page is
+rewritten when its registry entry changes, unless it has been edited since
+(tracked in .gcc-build/scaffold.json), in which case it is left alone.
+
+    python tools/scaffold_pages.py [--dry-run] [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from build_assets import compile_asset_rewriter
+from build_manifest import BuildManifest, inputs_key
+from page_metadata import PageHistory, PageMetadata, content_hash
+from parallel import add_jobs_argument, map_pages
+from sync_docs import compile_partials, load_assets, load_partials, page_params, render_page
+from templates import compile_template
+
+REGISTRY_PATH = 'tools/data/registry.json'
+SCAFFOLD_MANIFEST = '.gcc-build/scaffold.json'
+
+# Bump whenever PAGE_TEMPLATE or section rendering changes, so untouched
+# scaffolded pages are regenerated.
+SCAFFOLD_VERSION = 1
+
+SECTION_INDENT = ' ' * 16
+STEP = '    '
+
+PAGE_TEMPLATE = compile_template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - GCC Design System</title>
+    <link rel="stylesheet" href="{root}assets/css/styles.css">
+</head>
+<body>
+    <div class="layout">
+        <aside class="sidebar" id="sidebar">
+            <div class="sidebar-header">
+                <h1 class="sidebar-title">GCC Design System</h1>
+                <button class="sidebar-toggle" id="sidebarToggle" aria-label="Toggle navigation">
+                    <span></span>
+                    <span></span>
+                    <span></span>
+                </button>
+            </div>
+            <!-- GCC:SIDEBAR_START -->
+            <!-- GCC:SIDEBAR_END -->
+        </aside>
+
+        <main class="main-content">
+            <div class="content-wrapper">
+                <h1>{ui_title}</h1>{header}
+                <p class="lead">{description}</p>
+
+{sections}
+            </div>
+        </main>
+    </div>
+
+    <script src="{root}assets/js/script.js"></script>
+</body>
+</html>
+''')
+
+HEADER_REGION = '''
+
+                <!-- GCC:HEADER_START -->
+                <!-- GCC:HEADER_END -->
+'''
+
+
+class Registry:
+    """Page entries from registry.json, resolved against directory defaults."""
+
+    def __init__(self, defaults=None, pages=None):
+        self.defaults = defaults or {}
+        self.pages = pages or {}
+
+    @classmethod
+    def load(cls, path=REGISTRY_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('defaults'), data.get('pages'))
+
+    def entry(self, page):
+        """The fully resolved entry for `page`, with `{title}` filled in."""
+        own = self.pages[page]
+        defaults = self.defaults.get(os.path.dirname(page), {})
+        title = own['title']
+        entry = {'ui_title': title, 'header': False, 'description': '', 'sections': []}
+        for key, value in defaults.items():
+            if key not in own:
+                entry[key] = _fill_title(value, title)
+        entry.update(own)
+        return entry
+
+
+def _fill_title(value, title):
+    if isinstance(value, str):
+        return compile_template(value).render(title=title)
+    if isinstance(value, list):
+        return [_fill_title(item, title) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill_title(item, title) for key, item in value.items()}
+    return value
+
+
+def render_section(section):
+    """One <section class="section"> at the content indentation."""
+    inner = SECTION_INDENT + STEP
+    lines = [f'{SECTION_INDENT}<section class="section">', f'{inner}<h2>{section["heading"]}</h2>']
+    if section.get('text'):
+        lines.append(f'{inner}<p>{section["text"]}</p>')
+    lists = []
+    for label, key in (('Do', 'do'), ("Don't", 'dont')):
+        if section.get(key):
+            items = '\n'.join(f'{inner}{STEP}<li>{item}</li>' for item in section[key])
+            lists.append(f'{inner}<h3>{label}</h3>\n{inner}<ul>\n{items}\n{inner}</ul>')
+    if lists:
+        lines.append('\n\n'.join(lists))
+    lines.append(f'{SECTION_INDENT}</section>')
+    return '\n'.join(lines)
+
+
+def render_skeleton(page, entry):
+    """The page with empty GCC regions, before sync-style rendering."""
+    return PAGE_TEMPLATE.render(
+        title=entry['title'],
+        ui_title=entry['ui_title'],
+        description=entry['description'],
+        header=HEADER_REGION if entry['header'] else '',
+        sections='\n\n'.join(render_section(s) for s in entry['sections']),
+        root='../' * page.count('/'),
+    )
+
+
+def entry_key(entry):
+    return inputs_key(SCAFFOLD_VERSION, json.dumps(entry, sort_keys=True))
+
+
+# Installed once per worker process by init_worker.
+_worker = {}
+
+def init_worker(templates, assets, metadata, history):
+    _worker['templates'] = templates
+    _worker['metadata'] = metadata
+    _worker['history'] = history
+    _worker['rewrite_assets'] = compile_asset_rewriter(assets) if assets else None
+
+
+def scaffold_page(task):
+    """Render one page. Returns (page, output bytes or None, error)."""
+    page, entry = task
+    try:
+        raw = render_skeleton(page, entry).encode('utf-8')
+        params, _ = page_params(raw, page, _worker['metadata'], _worker['history'])
+        output = render_page(raw, params, _worker['templates'], _worker['rewrite_assets'])
+        return page, output, None
+    except Exception as e:
+        return page, None, str(e)
+
+
+def plan(registry, records):
+    """Return [(page, entry, reason)] for pages that need (re)writing."""
+    tasks = []
+    for page in registry.pages:
+        entry = registry.entry(page)
+        if not os.path.exists(page):
+            tasks.append((page, entry, 'created'))
+            continue
+        record = records.get(page)
+        if record is None or record['inputs'] == entry_key(entry):
+            continue
+        with open(page, 'rb') as f:
+            if content_hash(f.read()) != record['hash']:
+                print(f"Skipping {page}: edited since it was scaffolded")
+                continue
+        tasks.append((page, entry, 'updated'))
+    return tasks
+
+
+def scaffold(dry_run=False, jobs=1):
+    started = time.perf_counter()
+    registry = Registry.load()
+    records = BuildManifest(SCAFFOLD_MANIFEST).load()
+    tasks = plan(registry, records)
+    if dry_run:
+        for page, _entry, reason in tasks:
+            print(f"Would write {page} ({reason})")
+        print(f"{len(tasks)} of {len(registry.pages)} registry pages would be written.")
+        return True
+
+    partials = load_partials()
+    initargs = (compile_partials(partials), load_assets(), PageMetadata.load(), PageHistory().load())
+    results = map_pages(scaffold_page, [(page, entry) for page, entry, _ in tasks],
+                        jobs=jobs, initializer=init_worker, initargs=initargs)
+
+    failed = False
+    for (page, entry, reason), (_, output, error) in zip(tasks, results):
+        if error is not None:
+            print(f"Error scaffolding {page}: {error}")
+            failed = True
+            continue
+        os.makedirs(os.path.dirname(page) or '.', exist_ok=True)
+        with open(page, 'wb') as f:
+            f.write(output)
+        records.record(page, entry_key(entry), content_hash(output))
+        print(f"{reason.capitalize()}: {page}")
+
+    records.prune(registry.pages)
+    records.save()
+    elapsed = time.perf_counter() - started
+    print(f"Done! {len(tasks)} of {len(registry.pages)} registry pages written in {elapsed:.3f}s.")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create missing doc pages from tools/data/registry.json.')
+    parser.add_argument('--dry-run', action='store_true', help='list the pages that would be written')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    if not scaffold(dry_run=args.dry_run, jobs=args.jobs):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Local dev/preview server for the built docs tree.
+
+Unlike `python -m http.server` this behaves like production:
+
+- strong ETags (page hashes from the build manifest, content hashes for
+  everything else) and 304 Not Modified on If-None-Match;
+- gzip: the precompressed .gz sibling written by build_assets.py when there
+  is one, otherwise compressed on the fly (and cached) for text types;
+- Cache-Control from the asset manifest, the same values as _headers;
+- live reload: pages get a tiny EventSource snippet and are reloaded over
+  server-sent events after watch_docs.py rebuilds them (--no-watch to turn
+  this off, e.g. when used as a load-test target).
+
+Threaded, with HTTP/1.1 keep-alive, so it handles many concurrent clients.
+
+    python tools/serve.py [--port 8000] [--bind 127.0.0.1] [--no-watch]
+"""
+
+import argparse
+import fnmatch
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import watch_docs
+from build_assets import ASSET_MANIFEST, REVALIDATE, load_asset_manifest
+from build_manifest import MANIFEST_PATH, BuildManifest, hash_bytes, stat_signature
+
+DEFAULT_PORT = 8000
+LIVE_RELOAD_PATH = '/__livereload'
+KEEPALIVE_SECONDS = 15
+GZIP_CACHE_BYTES = 32 * 1024 * 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+LIVE_RELOAD_SNIPPET = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}")'
+    '.addEventListener("reload", function () { location.reload(); });</script>'
+).encode('utf-8')
+
+
+class _FileState:
+    """Cached validators for one file, keyed by its stat signature."""
+
+    def __init__(self, signature, etag):
+        self.signature = signature
+        self.etag = etag
+
+
+class SiteCache:
+    """Build metadata and per-file validators shared by all handler threads."""
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.files = {}
+        self.gzipped = OrderedDict()    # (path, etag) -> compressed bytes
+        self.gzipped_bytes = 0
+        # Empty until the files exist (their signature is None until then).
+        self._manifest = BuildManifest(os.path.join(root, MANIFEST_PATH))
+        self._manifest_signature = None
+        self._headers = {}
+        self._headers_signature = None
+
+    def _signature(self, path):
+        try:
+            return stat_signature(os.path.join(self.root, path))
+        except OSError:
+            return None
+
+    def build_manifest(self):
+        signature = self._signature(MANIFEST_PATH)
+        if signature != self._manifest_signature:
+            self._manifest = BuildManifest(os.path.join(self.root, MANIFEST_PATH)).load()
+            self._manifest_signature = signature
+        return self._manifest
+
+    def cache_headers(self):
+        """URL pattern -> Cache-Control, from the asset manifest."""
+        signature = self._signature(ASSET_MANIFEST)
+        if signature != self._headers_signature:
+            manifest = load_asset_manifest(os.path.join(self.root, ASSET_MANIFEST)) or {}
+            self._headers = manifest.get('headers', {})
+            self._headers_signature = signature
+        return self._headers
+
+    def cache_control(self, url_path):
+        with self.lock:
+            headers = self.cache_headers()
+        if url_path in headers:
+            return headers[url_path]
+        for pattern, value in headers.items():
+            if '*' in pattern and fnmatch.fnmatchcase(url_path, pattern):
+                return value
+        return REVALIDATE
+
+    def etag(self, rel_path, data, signature):
+        """Strong ETag for a file's current content."""
+        with self.lock:
+            state = self.files.get(rel_path)
+            if state is not None and state.signature == signature:
+                return state.etag
+            entry = self.build_manifest().get(rel_path)
+        if entry and entry.get('stat') == signature:
+            digest = entry['hash']
+        else:
+            digest = hash_bytes(data)
+        etag = f'"{digest[:16]}"'
+        with self.lock:
+            self.files[rel_path] = _FileState(signature, etag)
+        return etag
+
+    def compressed(self, key, data):
+        """gzip `data`, keeping recent results up to GZIP_CACHE_BYTES."""
+        with self.lock:
+            cached = self.gzipped.get(key)
+            if cached is not None:
+                self.gzipped.move_to_end(key)
+                return cached
+        compressed = gzip.compress(data, compresslevel=6, mtime=0)
+        with self.lock:
+            self.gzipped[key] = compressed
+            self.gzipped_bytes += len(compressed)
+            while self.gzipped_bytes > GZIP_CACHE_BYTES and len(self.gzipped) > 1:
+                _, evicted = self.gzipped.popitem(last=False)
+                self.gzipped_bytes -= len(evicted)
+        return compressed
+
+
+class LiveReload:
+    """Wakes every SSE client when pages are rebuilt."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.pages = []
+
+    def notify(self, pages):
+        with self.condition:
+            self.generation += 1
+            self.pages = list(pages)
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation, self.pages
+
+
+class DocsRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'GCCDocs/1.0'
+
+    def __init__(self, *args, site=None, live_reload=None, **kwargs):
+        self.site = site
+        self.live_reload = live_reload
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path == LIVE_RELOAD_PATH and self.live_reload is not None:
+            self._serve_events()
+            return
+        # Never expose .git/, .gcc-build/ or other hidden files and folders.
+        if any(segment.startswith('.') for segment in url_path.split('/')):
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return
+
+        fs_path = self.translate_path(self.path)
+        if os.path.isdir(fs_path):
+            if not url_path.endswith('/'):
+                self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+                self.send_header('Location', url_path + '/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            fs_path = os.path.join(fs_path, 'index.html')
+        try:
+            with open(fs_path, 'rb') as f:
+                data = f.read()
+                signature = stat_signature(fs_path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return
+
+        rel_path = os.path.relpath(fs_path, self.site.root)
+        content_type = self.guess_type(fs_path)
+        etag = self.site.etag(rel_path, data, signature)
+        injected = content_type == 'text/html' and self.live_reload is not None
+        if injected:
+            etag = etag[:-1] + '-lr"'
+        encoding = None
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and content_type.startswith(COMPRESSIBLE_TYPES):
+            encoding = 'gzip'
+            etag = etag[:-1] + '-gz"'
+
+        # Answer revalidations before doing any work on the body.
+        cache_control = self.site.cache_control('/' + rel_path.replace(os.sep, '/'))
+        if etag in parse_etags(self.headers.get('If-None-Match')):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(etag, cache_control)
+            self.end_headers()
+            return
+
+        if injected:
+            data = inject_live_reload(data)
+        if encoding:
+            data = self._gzipped(fs_path, signature, data, etag, injected)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self._send_validators(etag, cache_control)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def _gzipped(self, fs_path, signature, data, etag, modified):
+        # Prefer the .gz written by build_assets.py if it is current.
+        try:
+            if not modified and os.stat(fs_path + '.gz').st_mtime_ns >= signature[0]:
+                with open(fs_path + '.gz', 'rb') as f:
+                    return f.read()
+        except OSError:
+            pass
+        return self.site.compressed((fs_path, etag), data)
+
+    def _send_validators(self, etag, cache_control):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+
+    def _serve_events(self):
+        """Hold the connection open and send a `reload` event per rebuild."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        generation = self.live_reload.generation
+        try:
+            self.wfile.write(b'retry: 1000\n\n')
+            self.wfile.flush()
+            while True:
+                latest, pages = self.live_reload.wait(generation, KEEPALIVE_SECONDS)
+                if latest == generation:
+                    self.wfile.write(b': keep-alive\n\n')
+                else:
+                    generation = latest
+                    self.wfile.write(f"event: reload\ndata: {' '.join(pages)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def parse_etags(header):
+    if not header:
+        return set()
+    return {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+
+def inject_live_reload(data):
+    index = data.rfind(b'</body>')
+    if index == -1:
+        return data + LIVE_RELOAD_SNIPPET
+    return data[:index] + LIVE_RELOAD_SNIPPET + data[index:]
+
+
+class DocsServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+    verbose = False
+
+
+def make_server(bind='127.0.0.1', port=DEFAULT_PORT, root='.', live_reload=None):
+    site = SiteCache(os.path.abspath(root))
+    handler = partial(DocsRequestHandler, directory=site.root, site=site, live_reload=live_reload)
+    return DocsServer((bind, port), handler)
+
+
+def start_watcher(live_reload, force_polling=False):
+    """Run watch_docs in the background, notifying SSE clients on rebuild."""
+    thread = threading.Thread(
+        target=watch_docs.watch,
+        kwargs={'force_polling': force_polling, 'on_rebuild': live_reload.notify},
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the docs with ETags, gzip, cache headers and live reload.')
+    parser.add_argument('--bind', default='127.0.0.1', help='address to bind (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'port (default {DEFAULT_PORT})')
+    parser.add_argument('--no-watch', action='store_true',
+                        help='serve only: no rebuilds and no live reload')
+    parser.add_argument('--poll', action='store_true', help='watch by polling instead of inotify')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    live_reload = None if args.no_watch else LiveReload()
+    server = make_server(args.bind, args.port, live_reload=live_reload)
+    server.verbose = args.verbose
+    if live_reload is not None:
+        start_watcher(live_reload, args.poll)
+    print(f"Serving {os.getcwd()} at http://{args.bind}:{server.server_port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+// GCC Design System docs service worker. Generated by
+// tools/build_service_worker.py from tools/sw-template.js -- edit the template.
+//
+// Pages and fingerprinted assets listed in precache-manifest.json are cached
+// on install, each under a key carrying its revision, so a deploy only
+// refetches the entries whose revision changed. Precached assets are served
+// cache-first, pages stale-while-revalidate; everything else under assets/
+// (search shards, fragments) goes to the network as usual.
+
+const PRECACHE_REVISION = '__PRECACHE_REVISION__';
+const PRECACHE = 'gcc-precache-v1';
+const RUNTIME = 'gcc-runtime-v1';
+const MANIFEST_URL = new URL('precache-manifest.json', self.location).href;
+
+function cacheKey(entry) {
+    const url = new URL(entry.url, self.location);
+    if (entry.revision) url.searchParams.set('__rev', entry.revision);
+    return url.href;
+}
+
+let manifestPromise = null;
+
+// url -> cache key, from the manifest stored alongside the precache.
+function precacheKeys() {
+    if (!manifestPromise) {
+        manifestPromise = caches.open(PRECACHE)
+            .then(cache => cache.match(MANIFEST_URL))
+            .then(response => response ? response.json() : { entries: [] })
+            .then(manifest => new Map(manifest.entries.map(entry =>
+                [new URL(entry.url, self.location).href, cacheKey(entry)])));
+    }
+    return manifestPromise;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const response = await fetch(MANIFEST_URL + '?rev=' + PRECACHE_REVISION, { cache: 'no-cache' });
+        if (!response.ok) throw new Error('precache manifest unavailable');
+        const manifest = await response.clone().json();
+        const cache = await caches.open(PRECACHE);
+        const cached = new Set((await cache.keys()).map(request => request.url));
+        // Entries whose revision is already cached are not refetched.
+        await Promise.all(manifest.entries.filter(entry => !cached.has(cacheKey(entry))).map(async entry => {
+            const fetched = await fetch(new URL(entry.url, self.location), { cache: 'no-cache' });
+            if (fetched.ok) await cache.put(cacheKey(entry), fetched);
+        }));
+        await cache.put(MANIFEST_URL, response);
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        manifestPromise = null;
+        const keys = new Set((await precacheKeys()).values());
+        keys.add(MANIFEST_URL);
+        const cache = await caches.open(PRECACHE);
+        // Evict outdated revisions and entries no longer in the manifest.
+        for (const request of await cache.keys()) {
+            if (!keys.has(request.url)) await cache.delete(request);
+        }
+        // Runtime copies of pages may predate the new precache.
+        await caches.delete(RUNTIME);
+        for (const name of await caches.keys()) {
+            if (name !== PRECACHE && name !== RUNTIME && name.startsWith('gcc-')) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+function cleanUrl(url) {
+    const clean = new URL(url);
+    clean.hash = '';
+    clean.search = '';
+    if (clean.pathname.endsWith('/')) clean.pathname += 'index.html';
+    return clean.href;
+}
+
+async function fromPrecache(url) {
+    const key = (await precacheKeys()).get(url);
+    return key ? (await caches.open(PRECACHE)).match(key) : undefined;
+}
+
+async function cacheFirst(request) {
+    return await fromPrecache(cleanUrl(request.url)) || fetch(request);
+}
+
+async function staleWhileRevalidate(event) {
+    const url = cleanUrl(event.request.url);
+    const runtime = await caches.open(RUNTIME);
+    const cached = await runtime.match(url) || await fromPrecache(url);
+    const network = fetch(event.request).then(response => {
+        if (response.ok) return runtime.put(url, response.clone()).then(() => response);
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+    const scopePath = new URL(self.registration.scope).pathname;
+    const path = url.pathname.slice(scopePath.length);
+
+    if (request.mode === 'navigate' || path.endsWith('.html') || path === '') {
+        event.respondWith(staleWhileRevalidate(event));
+    } else if (path.startsWith('assets/')) {
+        event.respondWith(cacheFirst(request));
+    }
+});
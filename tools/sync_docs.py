@@ -1,69 +1,348 @@
+import argparse
 import os
-from datetime import datetime
+import sys
+
+import instrumentation
+from build_assets import compile_asset_rewriter, load_asset_manifest
+from build_manifest import BuildManifest, hash_bytes, inputs_key
+from instrumentation import STATS, Progress
+import navigation
+from navigation import nav_hash, render_sidebar
+from page_metadata import PageHistory, PageMetadata, content_hash
+from parallel import add_jobs_argument, map_pages
+from regions import RegionIndex
+from rewrite_engine import TARGET_DIRS, discover_html_files
+from templates import compile_template
 
 # Configuration
 PARTIALS_DIR = 'tools/partials'
-TARGET_DIRS = ['components', 'foundations', 'patterns', 'product-specific', 'meta']
-TODAY = datetime.now().strftime('%Y-%m-%d')
+
+# Partials injected into GCC:<NAME>_START/END regions. Any other region is
+# filled from tools/partials/<name>.html (lower-cased, '_' -> '-') if present.
+REGION_PARTIALS = {
+    'HEADER': 'component-header.html',
+}
+
+# Region filled with the sidebar rendered from tools/data/nav.json.
+NAV_REGION = 'SIDEBAR'
+
+# Bump whenever the way pages are rewritten changes, so every page rebuilds.
+TRANSFORM_VERSION = 5
 
 def get_root_prefix(file_path):
     depth = len(file_path.split(os.sep)) - 1
     return '../' * depth if depth > 0 else ''
 
-def sync():
-    # Load partials
-    with open(os.path.join(PARTIALS_DIR, 'sidebar.html'), 'r') as f:
-        sidebar_template = f.read()
-    with open(os.path.join(PARTIALS_DIR, 'component-header.html'), 'r') as f:
-        header_template = f.read()
+def partial_for_region(name):
+    """Return the partial file injected into the GCC:<name> region."""
+    return REGION_PARTIALS.get(name, name.lower().replace('_', '-') + '.html')
+
+def load_partials():
+    """Read every partial template as raw bytes, keyed by file name."""
+    partials = {}
+    for name in sorted(os.listdir(PARTIALS_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(PARTIALS_DIR, name), 'rb') as f:
+                partials[name] = f.read()
+    return partials
 
-    # Process all HTML files
+def is_page(file_path):
+    """True if sync manages `file_path` (a relative path)."""
+    if not file_path.endswith('.html'):
+        return False
+    directory = os.path.dirname(file_path)
+    if directory == '':
+        return file_path == 'index.html'
+    return directory.split(os.sep, 1)[0] in TARGET_DIRS
+
+def discover_pages():
+    """index.html plus every page under TARGET_DIRS, including subfolders."""
     files_to_process = ['index.html']
     for d in TARGET_DIRS:
         if os.path.exists(d):
-            for f in os.listdir(d):
-                if f.endswith('.html'):
-                    files_to_process.append(os.path.join(d, f))
+            files_to_process.extend(os.path.join(d, f) for f in discover_html_files(d))
+    return files_to_process
+
+def partial_params(file_path, meta, last_updated):
+    """Slot values available to every partial for a page."""
+    root = get_root_prefix(file_path)
+    return dict(
+        STATUS=meta['status'],
+        STATUS_CLASS=meta['status'].lower().replace(' ', '-'),
+        OWNER=meta['owner'],
+        LAST_UPDATED=last_updated,
+        LAST_REVIEWED=meta['last_reviewed'] or last_updated,
+        FIGMA_URL=meta['figma_url'],
+        IMPLEMENTATION_URL=meta['implementation_url'],
+        CHANGELOG_URL=f"{root}meta/changelog.html",
+        ROOT=root,
+        PAGE=file_path,
+    )
+
+def page_params(raw, file_path, metadata, history):
+    """Partial params for a page plus its (content hash, last updated) pair."""
+    digest = content_hash(raw)
+    last_updated = history.last_updated(file_path, digest, raw)
+    params = partial_params(file_path, metadata.get(file_path), last_updated)
+    return params, (digest, last_updated)
+
+def render_page(raw, params, templates, rewrite_assets=None):
+    """Return page bytes with every known GCC marker region re-injected.
+
+    `templates` maps partial file names to compiled templates. Regions with
+    no matching partial are left untouched. Partials only use slots that
+    depend on the page's depth and metadata, so each rendering is cached
+    and reused by every page that shares them.
+    """
+    index = RegionIndex.scan(raw)
+    replacements = {}
+    for name in index.names():
+        if name == NAV_REGION:
+            replacements[name] = render_sidebar(params['PAGE'], indent='').encode('utf-8')
+            continue
+        template = templates.get(partial_for_region(name))
+        if template is not None:
+            replacements[name] = template.render_cached(**params).encode('utf-8')
+    output = index.splice(replacements)
+    # Point <link>/<script> at the fingerprinted assets from build_assets.py.
+    if rewrite_assets is not None:
+        output = rewrite_assets(output)
+    return output
+
+# Installed once per worker process by init_worker.
+_worker = {}
+
+def init_worker(templates, assets, metadata, history):
+    _worker['templates'] = templates
+    _worker['metadata'] = metadata
+    _worker['history'] = history
+    _worker['rewrite_assets'] = compile_asset_rewriter(assets) if assets else None
+    _worker['hashes'] = {}
+
+def sync_page(task):
+    """Render one page.
+
+    Returns (file_path, status, output_hash, history_entry, error, stats),
+    where history_entry is None if the page was not re-rendered and stats is
+    this task's instrumentation snapshot.
+    """
+    return _sync_page(*task) + (STATS.take(),)
+
+def _sync_page(file_path, built_hash):
+    try:
+        with STATS.timer('read'), open(file_path, 'rb') as f:
+            raw = f.read()
+        STATS.count('bytes_in', len(raw))
+        raw_hash = hash_bytes(raw)
+
+        # Already exactly what we built from these inputs last time.
+        if raw_hash == built_hash:
+            return file_path, 'unchanged', raw_hash, None, None
+
+        with STATS.timer('render'):
+            params, entry = page_params(raw, file_path, _worker['metadata'], _worker['history'])
+            output = render_page(raw, params, _worker['templates'], _worker['rewrite_assets'])
+
+        if output == raw:
+            return file_path, 'unchanged', raw_hash, entry, None
+        with STATS.timer('write'), open(file_path, 'wb') as f:
+            f.write(output)
+        STATS.count('bytes_out', len(output))
+        return file_path, 'written', hash_bytes(output), entry, None
+    except Exception as e:
+        return file_path, 'error', None, None, str(e)
+
+def expected_regions(raw, file_path):
+    """Hash of what sync would write into each region it manages.
 
+    Returns {name: sha256 of the region's inner bytes}. Renderings shared by
+    many pages (every partial at a given depth) are hashed once per worker.
+    """
+    index = RegionIndex.scan(raw, file_path)
+    params = None
+    expected = {}
+    for name in index.names():
+        if name == NAV_REGION:
+            content = render_sidebar(file_path, indent='')
+        else:
+            template = _worker['templates'].get(partial_for_region(name))
+            if template is None:
+                continue
+            if params is None:
+                params, _ = page_params(raw, file_path, _worker['metadata'], _worker['history'])
+            content = template.render_cached(**params)
+        digest = _worker['hashes'].get(content)
+        if digest is None:
+            digest = _worker['hashes'][content] = hash_bytes(b'\n' + content.encode('utf-8') + b'\n')
+        expected[name] = digest
+    return index, expected
+
+def check_page(file_path):
+    """Compare one page's regions with what sync would write.
+
+    Returns (file_path, stale region names, error, stats).
+    """
+    try:
+        with STATS.timer('read'), open(file_path, 'rb') as f:
+            raw = f.read()
+        STATS.count('bytes_in', len(raw))
+        with STATS.timer('compare'):
+            index, expected = expected_regions(raw, file_path)
+            stale = [name for name, digest in expected.items()
+                     if hash_bytes(index.inner(name)) != digest]
+        return file_path, stale, None, STATS.take()
+    except Exception as e:
+        return file_path, None, str(e), STATS.take()
+
+def compile_partials(partials):
+    """Compile raw partials (name -> bytes) into templates."""
+    return {name: compile_template(data.decode('utf-8')) for name, data in partials.items()}
+
+def load_assets():
+    """Source -> fingerprinted asset paths, or {} if assets are not built."""
+    manifest = load_asset_manifest()
+    return manifest.get('assets', {}) if manifest else {}
+
+def build_inputs_key(partials, assets=None):
+    """Everything a page's output depends on besides its own content."""
+    return inputs_key(
+        TRANSFORM_VERSION,
+        f'nav:{nav_hash()}',
+        *(f'{name}:{hash_bytes(data)}' for name, data in sorted(partials.items())),
+        *(f'{src}:{dst}' for src, dst in sorted((assets or {}).items())),
+    )
+
+def page_key(key, metadata, file_path):
+    """Inputs key for one page: the shared key plus the page's own metadata."""
+    return inputs_key(key, metadata.signature(file_path))
+
+def sync(force=False, jobs=1, quiet=False):
+    with STATS.timer('load-inputs'):
+        partials = load_partials()
+        templates = compile_partials(partials)
+        assets = load_assets()
+        key = build_inputs_key(partials, assets)
+        metadata = PageMetadata.load()
+        history = PageHistory().load()
+        manifest = BuildManifest().load()
+
+    with STATS.timer('discover'):
+        files_to_process = discover_pages()
+
+    # Fast path: pages untouched since we last built them from the same inputs
+    # are skipped without being read.
+    tasks = []
+    keys = {}
+    skipped = 0
     for file_path in files_to_process:
-        print(f"Processing {file_path}...")
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        root = get_root_prefix(file_path)
-
-        # 1. Inject Sidebar
-        if '<!-- GCC:SIDEBAR_START -->' in content:
-            sidebar = sidebar_template.replace('{ROOT}', root)
-            start_marker = '<!-- GCC:SIDEBAR_START -->'
-            end_marker = '<!-- GCC:SIDEBAR_END -->'
-            parts = content.split(start_marker)
-            after_end = parts[1].split(end_marker)[1]
-            content = f"{parts[0]}{start_marker}\n{sidebar}\n{end_marker}{after_end}"
-
-        # 2. Inject Header (only for components/patterns/product-specific)
-        if '<!-- GCC:HEADER_START -->' in content:
-            header = header_template.format(
-                STATUS="Stable",
-                STATUS_CLASS="stable",
-                OWNER="GCC Design System",
-                LAST_UPDATED=TODAY,
-                LAST_REVIEWED=TODAY,
-                FIGMA_URL="#",
-                IMPLEMENTATION_URL="#",
-                CHANGELOG_URL=f"{root}meta/changelog.html",
-                ROOT=root
-            )
-            start_marker = '<!-- GCC:HEADER_START -->'
-            end_marker = '<!-- GCC:HEADER_END -->'
-            parts = content.split(start_marker)
-            after_end = parts[1].split(end_marker)[1]
-            content = f"{parts[0]}{start_marker}\n{header}\n{end_marker}{after_end}"
-
-        with open(file_path, 'w') as f:
-            f.write(content)
-
-    print("Done! All files synced.")
+        keys[file_path] = page_key(key, metadata, file_path)
+        if not force and manifest.is_fresh(file_path, keys[file_path]):
+            skipped += 1
+            continue
+        entry = None if force else manifest.get(file_path)
+        built_hash = entry['hash'] if entry and entry.get('inputs') == keys[file_path] else None
+        tasks.append((file_path, built_hash))
+
+    results = map_pages(sync_page, tasks, jobs=jobs, initializer=init_worker,
+                        initargs=(templates, assets, metadata, history))
+
+    written = 0
+    errors = []
+    STATS.count('pages_skipped', skipped)
+    progress = Progress(len(tasks), quiet)
+    for file_path, status, output_hash, history_entry, error, stats in results:
+        STATS.merge(stats)
+        if status == 'error':
+            errors.append(file_path)
+            print(f"Error processing {file_path}: {error}")
+            progress.step()
+            continue
+        if status == 'written':
+            progress.step(f"Processing {file_path}...")
+            written += 1
+        else:
+            progress.step()
+            skipped += 1
+            STATS.count('pages_unchanged')
+        if history_entry is not None:
+            history.record(file_path, *history_entry)
+        manifest.record(file_path, keys[file_path], output_hash)
+    progress.close()
+    STATS.count('pages_written', written)
+
+    if navigation.write_shared_nav():
+        print(f"Wrote {navigation.SHARED_NAV_PATH}")
+
+    with STATS.timer('save-state'):
+        manifest.prune(files_to_process)
+        manifest.save()
+        history.prune(files_to_process)
+        history.save()
+    print(f"Done! {written} written, {skipped} unchanged.")
+    return not errors
+
+def shared_nav_current():
+    """True if the shared nav file matches nav.json (or correctly doesn't exist)."""
+    expected = navigation.shared_nav_bytes()
+    try:
+        with open(navigation.SHARED_NAV_PATH, 'rb') as f:
+            return f.read() == expected
+    except FileNotFoundError:
+        return expected is None
+
+def check(jobs=1):
+    """Report pages whose regions differ from the current partials and nav.
+
+    Writes nothing. Pages the manifest shows untouched since they were built
+    from the current inputs are not read at all.
+    """
+    partials = load_partials()
+    assets = load_assets()
+    key = build_inputs_key(partials, assets)
+    metadata = PageMetadata.load()
+    history = PageHistory().load()
+    manifest = BuildManifest().load()
+
+    files_to_process = discover_pages()
+    to_check = [file_path for file_path in files_to_process
+                if not manifest.is_fresh(file_path, page_key(key, metadata, file_path))]
+    results = map_pages(check_page, to_check, jobs=jobs, initializer=init_worker,
+                        initargs=(compile_partials(partials), assets, metadata, history))
+
+    stale_pages = 0
+    errors = 0
+    STATS.count('pages_skipped', len(files_to_process) - len(to_check))
+    for file_path, stale, error, stats in results:
+        STATS.merge(stats)
+        if error is not None:
+            print(f"Error checking {file_path}: {error}")
+            errors += 1
+        elif stale:
+            print(f"{file_path}: stale {', '.join(stale)}")
+            stale_pages += 1
+    if not shared_nav_current():
+        print(f"{navigation.SHARED_NAV_PATH}: stale")
+        stale_pages += 1
+    print(f"Checked {len(files_to_process)} pages: {stale_pages} stale"
+          + (f", {errors} errors." if errors else "."))
+    return not (stale_pages or errors)
+
+def main():
+    parser = argparse.ArgumentParser(description='Inject shared partials into every doc page.')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the build manifest and re-render every page')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; list pages whose regions are out of date and exit 1 if any')
+    add_jobs_argument(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    if args.check:
+        ok = instrumentation.run(args, 'sync_docs --check', check, jobs=args.jobs)
+    else:
+        ok = instrumentation.run(args, 'sync_docs', sync, force=args.force, jobs=args.jobs,
+                                 quiet=args.quiet)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    sync()
\ No newline at end of file
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Precompiled `{NAME}` templates for partials and generated pages.
+
+A template is parsed once into alternating literal and slot segments, so
+rendering is a single join instead of re-scanning the text with str.format
+or str.replace for every page. Rendered results can be memoized: the tools
+only ever render a handful of distinct parameter sets (one per directory
+depth), so every page after the first at a given depth is a cache hit.
+
+Syntax follows str.format for the subset the partials use: `{NAME}` is a
+slot, `{{` and `}}` are literal braces. Any other brace is kept literally.
+"""
+
+import re
+
+_TOKEN_RE = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+class Template:
+    """A compiled template: literal text interleaved with named slots."""
+
+    def __init__(self, text):
+        self.text = text
+        literals = []
+        slots = []
+        buf = []
+        last = 0
+        for match in _TOKEN_RE.finditer(text):
+            buf.append(text[last:match.start()])
+            last = match.end()
+            if match.group(1) is None:
+                buf.append(match.group(0)[0])
+            else:
+                literals.append(''.join(buf))
+                slots.append(match.group(1))
+                buf = []
+        buf.append(text[last:])
+        literals.append(''.join(buf))
+        # Invariant: len(literals) == len(slots) + 1
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+        self._cache = {}
+
+    @property
+    def names(self):
+        """The distinct slot names used by the template."""
+        return frozenset(self.slots)
+
+    def render(self, **params):
+        """Fill every slot from `params` (KeyError if one is missing)."""
+        literals = self.literals
+        if not self.slots:
+            return literals[0]
+        parts = [literals[0]]
+        for index, name in enumerate(self.slots, 1):
+            parts.append(str(params[name]))
+            parts.append(literals[index])
+        return ''.join(parts)
+
+    def render_cached(self, **params):
+        """Like render(), memoized on the parameters the template uses."""
+        key = tuple(sorted((name, params[name]) for name in self.names))
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = self._cache[key] = self.render(**params)
+            return result
+
+    def map_literals(self, func):
+        """A copy with `func` applied to every literal segment; slots are kept."""
+        text = ''.join(literal.replace('{', '{{').replace('}', '}}') + f'{{{slot}}}'
+                       for literal, slot in zip(map(func, self.literals), self.slots))
+        return Template(text + func(self.literals[-1]).replace('{', '{{').replace('}', '}}'))
+
+    def __getstate__(self):
+        # The render cache is per process; workers start with an empty one.
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def __repr__(self):
+        return f"Template(slots={self.slots!r})"
+
+
+def compile_template(text):
+    """Compile `text` into a Template."""
+    return Template(text)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for html_regions.py, including its linear-time guarantee.
+
+    python tools/test_html_regions.py
+"""
+
+import time
+import unittest
+
+from html_regions import find_elements, replace_elements
+
+# Unclosed or malformed constructs that make backtracking parsers rescan.
+PATHOLOGICAL = ['<b ', '<!--', '<b a="', "<a href='x' ", '<div class="x">', '</', '<!', 'a<b']
+SIZE = 8000
+# Linear scans take ~4x as long on 4x the input; quadratic ones ~16x.
+MAX_GROWTH = 8
+
+
+def _best_time(html, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        find_elements(html, 'nav.sidebar-nav')
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class FindElementsTest(unittest.TestCase):
+
+    def test_nested_same_tag(self):
+        html = '<p><nav class="sidebar-nav"><nav>x</nav></nav> tail</p>'
+        start, end = find_elements(html, 'nav.sidebar-nav')[0]
+        self.assertEqual(html[start:end], '<nav class="sidebar-nav"><nav>x</nav></nav>')
+
+    def test_quoted_gt_and_comments(self):
+        html = ('<!-- <nav class="sidebar-nav"> --><nav data-x="a>b" class="sidebar-nav">'
+                '<script>"</nav>"</script></nav>')
+        self.assertEqual(find_elements(html, 'nav.sidebar-nav'), [(34, len(html))])
+
+    def test_has_filter(self):
+        html = ('<li class="nav-subsection"><span class="nav-subsection-title">Color</span></li>'
+                '<li class="nav-subsection"><span class="nav-subsection-title"> Typography </span></li>')
+        self.assertEqual(replace_elements(html, 'li.nav-subsection', 'X',
+                                          has=('span.nav-subsection-title', 'Typography')),
+                         html[:html.index('</li>') + 5] + 'X')
+
+    def test_unclosed_element_is_ignored(self):
+        self.assertEqual(find_elements('<nav class="sidebar-nav"><a>', 'nav.sidebar-nav'), [])
+
+    def test_pathological_input_is_linear(self):
+        for pattern in PATHOLOGICAL:
+            with self.subTest(pattern=pattern):
+                small = _best_time(pattern * SIZE)
+                large = _best_time(pattern * (4 * SIZE))
+                self.assertLess(large, max(small, 0.005) * MAX_GROWTH)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Run every page updater in a single pass over the docs tree.
+
+Each page is read once, passed through PIPELINE in order and written at most
+once. Run a subset with --only, e.g. `--only page-titles typography-nav`.
+"""
+
+import argparse
+import sys
+
+import instrumentation
+import update_navigation_labels
+import update_page_titles
+import update_site_structure
+import update_typography_nav
+from parallel import add_jobs_argument
+from rewrite_engine import run_pipeline
+
+# Order matters: later transforms see the output of earlier ones.
+PIPELINE = [
+    update_navigation_labels.TRANSFORM,
+    update_page_titles.TRANSFORM,
+    update_site_structure.TRANSFORM,
+    update_typography_nav.TRANSFORM,
+]
+
+def select_transforms(names):
+    """Return the PIPELINE entries named in `names`, keeping pipeline order."""
+    by_name = {t.name: t for t in PIPELINE}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown transform(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(by_name)}")
+    return [t for t in PIPELINE if t.name in names]
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the page updaters in one pass.')
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help='run only these transforms (pipeline order is kept)')
+    parser.add_argument('--list', action='store_true', help='list transforms and exit')
+    add_jobs_argument(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        for t in PIPELINE:
+            print(t.name)
+        return
+
+    transforms = select_transforms(args.only) if args.only else PIPELINE
+    _, errors = instrumentation.run(args, 'update_docs', run_pipeline, transforms,
+                                    jobs=args.jobs, quiet=args.quiet)
+    if errors:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,10 @@
 Update navigation labels in all HTML files to match the updated rules.
 """
 
-import os
 import re
-from pathlib import Path
+
+from multi_replace import MultiReplacer
+from rewrite_engine import Transform, rewrite_file, run_cli
 
 # Define the new navigation labels based on docs-site-rules.md
 nav_updates = {
@@ -25,53 +26,35 @@ typography_labels = {
     'Noto Sans Japan (JP)': 'Noto Sans Japan (JP)',
 }
 
+# One scan covers every label: plain and active nav links alike.
+# Pattern for nav links: <a href="..." class="nav-link">Old Label</a>
+# Pattern for active nav links: <a href="..." class="nav-link active">Old Label</a>
+label_pattern = (r'(<a href="[^"]*" class="nav-link(?: active)?">)('
+                 + '|'.join(re.escape(label) for label in nav_updates)
+                 + r')(</a>)')
+
+label_replacer = MultiReplacer(
+    [(label_pattern, lambda m: f'{m.group(1)}{nav_updates[m.group(2)]}{m.group(3)}')],
+    triggers=[f'">{label}</a>' for label in nav_updates],
+)
+
+def update_navigation_labels(content, file_path=None):
+    """Rewrite navigation labels in a page's content."""
+    return label_replacer.sub(content)
+
+TRANSFORM = Transform('navigation-labels', update_navigation_labels)
+
 def update_navigation_in_file(file_path):
     """Update navigation labels in a single HTML file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Update each navigation label
-        for old_label, new_label in nav_updates.items():
-            # Pattern to match navigation links with the old label
-            # Match both the link text and the href
-            patterns = [
-                # Pattern for nav links: <a href="..." class="nav-link">Old Label</a>
-                (rf'(<a href="[^"]*" class="nav-link">){re.escape(old_label)}(</a>)', 
-                 lambda m: f'{m.group(1)}{new_label}{m.group(2)}'),
-                # Pattern for active nav links: <a href="..." class="nav-link active">Old Label</a>
-                (rf'(<a href="[^"]*" class="nav-link active">){re.escape(old_label)}(</a>)', 
-                 lambda m: f'{m.group(1)}{new_label}{m.group(2)}'),
-            ]
-            
-            for pattern, replacement in patterns:
-                content = re.sub(pattern, replacement, content)
-        
-        # Only write if content changed
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+        return bool(rewrite_file(file_path, [TRANSFORM]))
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
         return False
 
 def main():
     """Update all HTML files in the project."""
-    project_root = Path('.')
-    html_files = list(project_root.rglob('*.html'))
-    
-    updated_count = 0
-    for html_file in html_files:
-        if update_navigation_in_file(html_file):
-            updated_count += 1
-            print(f"Updated: {html_file}")
-    
-    print(f"\nUpdated {updated_count} files.")
+    run_cli([TRANSFORM], __doc__)
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Watch the docs tree and re-sync only the pages affected by each change.
+
+Keeps sync_docs state warm between edits: compiled partial templates (and
+their per-depth render caches), the build manifest and a dependency graph of
+which pages contain which GCC marker regions, i.e. which partials they
+include. Editing a partial rebuilds just the pages that include it; editing
+a page rebuilds just that page. Bursts of events are debounced and coalesced
+into one rebuild.
+
+Uses inotify on Linux and falls back to polling elsewhere (or with --poll).
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import navigation
+import sync_docs
+from build_assets import ASSET_MANIFEST
+from build_manifest import BuildManifest, hash_bytes
+from page_metadata import METADATA_PATH, PageHistory, PageMetadata
+from regions import RegionIndex
+
+DEBOUNCE_SECONDS = 0.05
+POLL_INTERVAL = 0.5
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def watched_dirs():
+    """Directories whose direct children sync cares about."""
+    dirs = ['.', sync_docs.PARTIALS_DIR]
+    optional = [os.path.dirname(ASSET_MANIFEST), os.path.dirname(METADATA_PATH)]
+    dirs.extend(d for d in optional if os.path.isdir(d))
+    for target in sync_docs.TARGET_DIRS:
+        for dirpath, dirnames, _ in os.walk(target):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            dirs.append(os.path.normpath(dirpath))
+    return dirs
+
+
+class InotifyWatcher:
+    """Report changed paths using Linux inotify (no third-party dependency)."""
+
+    def __init__(self, dirs):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError('inotify is not available on this platform')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        for d in dirs:
+            self.add(d)
+
+    def add(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self.dirs[wd] = directory
+
+    def wait(self, timeout):
+        """Block up to `timeout` seconds; return the set of changed paths."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.normpath(os.path.join(directory, name))
+            if mask & IN_ISDIR:
+                # A target directory (e.g. product-specific/) or a folder
+                # inside one appeared.
+                if mask & (IN_CREATE | IN_MOVED_TO) and sync_docs.is_page(os.path.join(path, 'index.html')):
+                    self.add(path)
+                    changed.update(os.path.join(path, f) for f in os.listdir(path))
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compare (mtime, size) of watched files each interval."""
+
+    def __init__(self, dirs, interval=POLL_INTERVAL):
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        state = {}
+        for d in self.dirs:
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(('.html', '.json')):
+                    st = entry.stat()
+                    state[os.path.normpath(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {p for p in current.keys() | self.snapshot.keys()
+                   if current.get(p) != self.snapshot.get(p)}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class WarmSite:
+    """In-memory sync state kept across rebuilds."""
+
+    def __init__(self):
+        self.partials = sync_docs.load_partials()
+        self.templates = sync_docs.compile_partials(self.partials)
+        self._load_assets()
+        self.metadata = PageMetadata.load()
+        self.history = PageHistory().load()
+        self.manifest = BuildManifest().load()
+        # Non-page files written while working out what to rebuild.
+        self.outputs = []
+        # page -> partial files it includes, and the reverse mapping
+        self.page_partials = {}
+        self.dependents = {}
+        for page in sync_docs.discover_pages():
+            self._index_page(page)
+
+    def _load_assets(self):
+        """(Re)load the fingerprinted asset map; True if it changed."""
+        assets = sync_docs.load_assets()
+        changed = assets != getattr(self, 'assets', None)
+        self.assets = assets
+        self.rewrite_assets = sync_docs.compile_asset_rewriter(assets) if assets else None
+        self.key = sync_docs.build_inputs_key(self.partials, self.assets)
+        return changed
+
+    def _index_page(self, page, raw=None):
+        """(Re)record which partials `page` depends on."""
+        self._forget_page(page)
+        if raw is None:
+            try:
+                with open(page, 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                return
+        try:
+            names = RegionIndex.scan(raw).names()
+        except ValueError:
+            names = []
+        partials = {sync_docs.partial_for_region(n) for n in names}
+        self.page_partials[page] = partials
+        for partial in partials:
+            self.dependents.setdefault(partial, set()).add(page)
+
+    def _reload_nav(self):
+        """Re-read nav.json; return the pages that render the sidebar."""
+        navigation.clear_cache()
+        if navigation.write_shared_nav():
+            self.outputs.append(navigation.SHARED_NAV_PATH)
+        key = sync_docs.build_inputs_key(self.partials, self.assets)
+        if key == self.key:
+            return set()
+        self.key = key
+        return set(self.dependents.get(sync_docs.partial_for_region(sync_docs.NAV_REGION), ()))
+
+    def _reload_metadata(self):
+        """Reload page metadata; return the pages whose metadata changed."""
+        old = self.metadata
+        self.metadata = PageMetadata.load()
+        return {page for page in self.page_partials
+                if old.signature(page) != self.metadata.signature(page)}
+
+    def _forget_page(self, page):
+        for partial in self.page_partials.pop(page, ()):
+            self.dependents.get(partial, set()).discard(page)
+
+    def _reload_partial(self, name):
+        path = os.path.join(sync_docs.PARTIALS_DIR, name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = None
+        if data == self.partials.get(name):
+            return False
+        if data is None:
+            self.partials.pop(name, None)
+            self.templates.pop(name, None)
+        else:
+            self.partials[name] = data
+            self.templates[name] = sync_docs.compile_template(data.decode('utf-8'))
+        self.key = sync_docs.build_inputs_key(self.partials, self.assets)
+        return True
+
+    def affected_pages(self, changed):
+        """Map a set of changed paths to the pages that must be rebuilt."""
+        pages = set()
+        partials_dir = os.path.normpath(sync_docs.PARTIALS_DIR)
+        for path in changed:
+            if path == os.path.normpath(ASSET_MANIFEST):
+                # New fingerprints: every page's references may change.
+                if self._load_assets():
+                    pages |= set(self.page_partials)
+            elif path == os.path.normpath(navigation.NAV_PATH):
+                pages |= self._reload_nav()
+            elif path == os.path.normpath(METADATA_PATH):
+                pages |= self._reload_metadata()
+            elif os.path.dirname(path) == partials_dir:
+                name = os.path.basename(path)
+                if name.endswith('.html') and self._reload_partial(name):
+                    pages |= self.dependents.get(name, set())
+            elif sync_docs.is_page(path):
+                if os.path.exists(path):
+                    pages.add(path)
+                else:
+                    self._forget_page(path)
+                    self.manifest.forget(path)
+                    self.history.prune(self.page_partials)
+        return pages
+
+    def rebuild(self, pages):
+        """Re-render `pages`; returns the files actually written (pages and the shared nav)."""
+        written, self.outputs = self.outputs, []
+        for page in sorted(pages):
+            try:
+                with open(page, 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            raw_hash = hash_bytes(raw)
+            key = sync_docs.page_key(self.key, self.metadata, page)
+            # Our own write coming back as an event: nothing to do.
+            if self.manifest.matches(page, key, raw_hash):
+                self._index_page(page, raw)
+                continue
+            try:
+                params, entry = sync_docs.page_params(raw, page, self.metadata, self.history)
+                output = sync_docs.render_page(raw, params, self.templates, self.rewrite_assets)
+            except Exception as e:
+                # E.g. a partial saved mid-edit with an unknown {SLOT}: report
+                # it and keep watching; the next save rebuilds the page.
+                print(f"Error processing {page}: {e!r}")
+                continue
+            if output != raw:
+                with open(page, 'wb') as f:
+                    f.write(output)
+                written.append(page)
+            self._index_page(page, output)
+            self.history.record(page, *entry)
+            self.manifest.record(page, key, hash_bytes(output))
+        self.manifest.save()
+        self.history.save()
+        return written
+
+
+def make_watcher(force_polling=False):
+    dirs = watched_dirs()
+    if not force_polling:
+        try:
+            return InotifyWatcher(dirs)
+        except OSError as e:
+            print(f"inotify unavailable ({e}); falling back to polling.")
+    return PollingWatcher(dirs)
+
+
+def watch(force_polling=False, debounce=DEBOUNCE_SECONDS, on_rebuild=None):
+    """Run the watch loop until interrupted.
+
+    `on_rebuild(pages)` is called after every rebuild that wrote pages.
+    """
+    # Bring everything up to date first, then keep the state warm.
+    sync_docs.sync()
+    site = WarmSite()
+    watcher = make_watcher(force_polling)
+    print(f"Watching {len(site.page_partials)} pages ({type(watcher).__name__}). Ctrl+C to stop.")
+    try:
+        while True:
+            changed = watcher.wait(1.0)
+            if not changed:
+                continue
+            # Coalesce a burst of events (editor save = several writes).
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            started = time.perf_counter()
+            try:
+                pages = site.affected_pages(changed)
+                written = site.rebuild(pages)
+            except Exception as e:
+                print(f"Rebuild failed: {e!r}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            if written:
+                for page in written:
+                    print(f"Processing {page}...")
+                print(f"Rebuilt {len(written)} page(s) in {elapsed:.1f} ms.")
+                if on_rebuild is not None:
+                    on_rebuild(written)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--poll', action='store_true',
+                        help='use polling instead of inotify')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, metavar='SECONDS',
+                        help=f'quiet period before rebuilding (default {DEBOUNCE_SECONDS})')
+    args = parser.parse_args()
+    watch(force_polling=args.poll, debounce=args.debounce)
+
+
+if __name__ == '__main__':
+    main()